@@ -1,3 +1,12 @@
 """Simplified package exports for the unified backend."""
 
-from .backend import app, create_app  # noqa: F401
+from .backend import create_app  # noqa: F401
+
+
+def __getattr__(name: str):
+    # ``app`` is built lazily by the backend module; see ``backend.__getattr__``.
+    if name == "app":
+        from .backend import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,29 +9,62 @@ services.
 
 from __future__ import annotations
 
+import asyncio
+import calendar
 import copy
 import hashlib
-import json
+import hmac
 import math
+import mimetypes
+import mmap
+import multiprocessing
+import os
+import queue
 import sqlite3
 import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import contextmanager
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
 from functools import lru_cache
-from math import ceil, inf, isfinite, sqrt
+from math import ceil, isfinite, sqrt
 from pathlib import Path
+from tempfile import NamedTemporaryFile
 from textwrap import dedent
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
-from uuid import uuid4
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Type
 
+import anyio.to_thread
 import numpy as np
+import orjson
 import requests
-from fastapi import FastAPI, HTTPException
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.concurrency import run_in_threadpool
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Response
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+try:  # Optional JIT for the numeric kernels; they run as plain NumPy without it.
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on the environment
+    njit = None
+
+try:  # Optional asyncio HTTP client; Open-Meteo is fetched from worker threads without it.
+    import httpx
+except ImportError:  # pragma: no cover - depends on the environment
+    httpx = None
+
+try:  # Optional binary encoding offered to clients that ask for it.
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
 
 # ---------------------------------------------------------------------------
 # Persistence layer (formerly database.py)
@@ -58,25 +91,126 @@ class UserAlreadyExistsError(RuntimeError):
     """Raised when attempting to create a duplicated username."""
 
 
+# Password hashes memoised under a process-salted digest so plaintext passwords
+# never become cache keys; the salt is regenerated on every start.
+_PASSWORD_CACHE_SALT = secrets.token_bytes(16)
+_PASSWORD_CACHE_SIZE = 1000
+_password_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_password_cache_lock = threading.Lock()
+
+
+def _cached_password_hash(
+    password: str,
+    salt: Optional[bytes],
+    hasher: Callable[[str, Optional[bytes]], str],
+) -> str:
+    key = hashlib.blake2b(
+        password.encode("utf-8"), key=_PASSWORD_CACHE_SALT, salt=salt or b"", digest_size=16
+    ).digest()
+    with _password_cache_lock:
+        cached = _password_cache.get(key)
+        if cached is not None:
+            _password_cache.move_to_end(key)
+            return cached
+    digest = hasher(password, salt)
+    with _password_cache_lock:
+        _password_cache[key] = digest
+        while len(_password_cache) > _PASSWORD_CACHE_SIZE:
+            _password_cache.popitem(last=False)
+    return digest
+
+
+# Statements are shared module constants so every call hands sqlite3 the same
+# string and hits the per-connection prepared-statement cache.
+_SQL_INSERT_USER = "INSERT INTO users (username, username_lc, password_hash, salt) VALUES (?, ?, ?, ?)"
+# INSERT ... RETURNING (SQLite 3.35+) hands the new row back without a second query.
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_SQL_INSERT_USER_RETURNING = _SQL_INSERT_USER + " RETURNING id, username, created_at"
+_SQL_SELECT_USER_BY_ID = "SELECT id, username, created_at FROM users WHERE id = ?"
+_SQL_SELECT_USER_BY_USERNAME = "SELECT id, username, created_at FROM users WHERE username_lc = ?"
+_SQL_SELECT_CREDENTIALS = "SELECT id, username, created_at, password_hash, salt FROM users WHERE username_lc = ?"
+_SQL_UPDATE_PASSWORD = "UPDATE users SET password_hash = ?, salt = ? WHERE id = ?"
+_SQL_COUNT_USERS = "SELECT COUNT(*) FROM users"
+_SQL_INSERT_CHAT = "INSERT INTO chats (user_id, message, created_at) VALUES (?, ?, ?)"
+# The inner query walks ix_chats_created_id for the newest window; the outer one
+# returns it oldest first.
+_SQL_LIST_CHATS = """
+SELECT id, user_id, username, message, created_at
+FROM (
+    SELECT chats.id, chats.user_id, users.username, chats.message, chats.created_at
+    FROM chats
+    JOIN users ON users.id = chats.user_id
+    ORDER BY chats.created_at DESC, chats.id DESC
+    LIMIT ?
+)
+ORDER BY created_at ASC, id ASC
+"""
+# Same window encoded by SQLite itself, for routes that only forward the JSON.
+_SQL_LIST_CHATS_JSON = f"""
+SELECT json_group_array(
+    json_object('id', id, 'user_id', user_id, 'username', username, 'message', message, 'created_at', created_at)
+)
+FROM ({_SQL_LIST_CHATS})
+"""
+
+
 class DatabaseGateway:
     """Lightweight SQLite helper that exposes high level persistence methods."""
 
-    def __init__(self, base_dir: Optional[Path] = None) -> None:
+    # Chat inserts queued within this window are committed as one transaction.
+    CHAT_BATCH_WINDOW_S = 0.01
+    CHAT_BATCH_SIZE = 500
+    # Stored credentials per username, so repeated logins skip the users lookup.
+    CREDENTIALS_TTL_S = 300.0
+    CREDENTIALS_CACHE_SIZE = 1024
+    PASSWORD_ITERATIONS = 100_000
+    STATEMENT_CACHE_SIZE = 64
+
+    def __init__(self, base_dir: Optional[Path] = None, pool_size: Optional[int] = None) -> None:
         self.base_dir = base_dir or Path(__file__).resolve().parent
         self.data_dir = self.base_dir / "data"
         self.db_path = self.data_dir / "app.sqlite3"
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        # One writer plus a reader per core; extra connections past this are not pooled.
+        self.pool_size = pool_size or (os.cpu_count() or 4) + 1
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=self.pool_size)
+        self._chat_queue: Optional["asyncio.Queue[Tuple[int, str, str, asyncio.Future]]"] = None
+        self._chat_writer: Optional["asyncio.Task[None]"] = None
+        self._chat_loop: Optional[asyncio.AbstractEventLoop] = None
+        # SQLite serialises writers anyway; funnelling batched writes through one
+        # thread avoids busy-waiting on the write lock inside the shared pool.
+        # Created with the chat writer task, so a gateway reopened after close() works.
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._credentials: "OrderedDict[str, Tuple[float, UserRecord, str, Optional[bytes]]]" = OrderedDict()
+        self._credentials_lock = threading.Lock()
+
+    @staticmethod
+    def _configure(conn: sqlite3.Connection) -> None:
+        """Apply the per-connection PRAGMAs (WAL itself is persistent and set once)."""
+        conn.executescript(
+            """
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-64000;
+            PRAGMA mmap_size=2147483648;
+            PRAGMA busy_timeout=5000;
+            PRAGMA foreign_keys=ON;
+            """
+        )
 
     def initialise(self) -> None:
         with sqlite3.connect(self.db_path) as conn:
             conn.execute("PRAGMA journal_mode=WAL;")
+            self._configure(conn)
             conn.executescript(
                 """
                 CREATE TABLE IF NOT EXISTS users (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     username TEXT UNIQUE NOT NULL,
                     password_hash TEXT NOT NULL,
-                    created_at TEXT NOT NULL DEFAULT (DATETIME('now'))
+                    created_at TEXT NOT NULL DEFAULT (DATETIME('now')),
+                    salt BLOB,
+                    username_lc TEXT
                 );
 
                 CREATE TABLE IF NOT EXISTS chats (
@@ -86,113 +220,307 @@ class DatabaseGateway:
                     created_at TEXT NOT NULL DEFAULT (DATETIME('now')),
                     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
                 );
+
+                CREATE INDEX IF NOT EXISTS ix_chats_created_id ON chats(created_at DESC, id DESC);
+                CREATE INDEX IF NOT EXISTS ix_chats_user ON chats(user_id);
                 """
             )
+            # Databases created before salted hashes lack the column; their rows keep
+            # a NULL salt (plain SHA-256) until the user next logs in.
+            user_columns = {row[1] for row in conn.execute("PRAGMA table_info(users)")}
+            if "salt" not in user_columns:
+                conn.execute("ALTER TABLE users ADD COLUMN salt BLOB")
+            # Logins look users up by their lower-cased name, so it is stored and
+            # indexed instead of being folded per query.
+            if "username_lc" not in user_columns:
+                conn.execute("ALTER TABLE users ADD COLUMN username_lc TEXT")
+            conn.execute("UPDATE users SET username_lc = LOWER(username) WHERE username_lc IS NULL")
+            try:
+                conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username_lc ON users(username_lc)")
+            except sqlite3.IntegrityError:
+                # Legacy rows that differ only in case; still index them for lookups.
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_users_username_lc_dup ON users(username_lc)")
             conn.commit()
             # Remaining providers mirror the original implementation.
 
 
 
+    def _open(self) -> sqlite3.Connection:
+        # Autocommit mode: reads never hold a transaction open on a pooled
+        # connection, and writes opt in through ``transaction()``.
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None, cached_statements=self.STATEMENT_CACHE_SIZE
+        )
+        conn.row_factory = sqlite3.Row
+        self._configure(conn)
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Take a warm connection from the pool, opening a new one if it is empty."""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._open()
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return ``conn`` to the pool, discarding it when the pool is already full."""
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    async def aclose(self) -> None:
+        """Commit the queued chat messages, then stop the writer and close the pool."""
+        if (
+            self._chat_writer is not None
+            and not self._chat_writer.done()
+            and self._chat_loop is asyncio.get_running_loop()
+        ):
+            await self._chat_queue.join()
+        self._stop_chat_writer()
+        # Waiting for the writer thread would otherwise block the event loop.
+        await run_in_threadpool(self._close_connections)
+
+    def close(self) -> None:
+        """Synchronous close; chat messages still queued fail instead of being written."""
+        self._stop_chat_writer()
+        self._close_connections()
+
+    def _stop_chat_writer(self) -> None:
+        if self._chat_writer is not None:
+            self._chat_writer.cancel()
+            self._chat_writer = None
+        pending, self._chat_queue = self._chat_queue, None
+        while pending is not None and not pending.empty():
+            self._fail_chat_items([pending.get_nowait()])
+
+    @staticmethod
+    def _fail_chat_items(items: Sequence[Tuple[int, str, str, asyncio.Future]]) -> None:
+        for *_, future in items:
+            if not future.done():
+                future.set_exception(RuntimeError("La base de datos se ha cerrado."))
+
+    def _close_connections(self) -> None:
+        # Let a batch already handed to the writer thread commit before its pooled
+        # connection is closed, then stop the thread.
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.shutdown(wait=True)
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
     @contextmanager
     def connection(self) -> Iterator[sqlite3.Connection]:
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
+        conn = self.acquire()
         try:
             yield conn
         finally:
-            conn.close()
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Yield a pooled connection inside ``BEGIN IMMEDIATE``, committing on success."""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
     # ------------------------------------------------------------------
     # CRUD helpers
     # ------------------------------------------------------------------
 
-    def _hash_password(self, password: str) -> str:
-        digest = hashlib.sha256()
-        digest.update(password.encode("utf-8"))
-        return digest.hexdigest()
+    @classmethod
+    def _digest_password(cls, password: str, salt: Optional[bytes]) -> str:
+        if salt is None:
+            # Legacy rows stored an unsalted SHA-256 digest.
+            return hashlib.sha256(password.encode("utf-8")).hexdigest()
+        return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, cls.PASSWORD_ITERATIONS).hex()
+
+    def _hash_password(self, password: str, salt: Optional[bytes]) -> str:
+        return _cached_password_hash(password, salt, self._digest_password)
 
     def create_user(self, username: str, password: str) -> UserRecord:
-        password_hash = self._hash_password(password)
-        with self.connection() as conn:
-            try:
-                cursor = conn.execute(
-                    "INSERT INTO users (username, password_hash) VALUES (?, ?)",
-                    (username, password_hash),
-                )
-            except sqlite3.IntegrityError as exc:
-                raise UserAlreadyExistsError(username) from exc
-            user_id = cursor.lastrowid
-            conn.commit()
-            row = conn.execute(
-                "SELECT id, username, created_at FROM users WHERE id = ?",
-                (user_id,),
-            ).fetchone()
+        salt = secrets.token_bytes(16)
+        password_hash = self._hash_password(password, salt)
+        try:
+            with self.transaction() as conn:
+                params = (username, username.lower(), password_hash, salt)
+                if _SQLITE_HAS_RETURNING:
+                    row = conn.execute(_SQL_INSERT_USER_RETURNING, params).fetchone()
+                else:
+                    cursor = conn.execute(_SQL_INSERT_USER, params)
+                    row = conn.execute(_SQL_SELECT_USER_BY_ID, (cursor.lastrowid,)).fetchone()
+        except sqlite3.IntegrityError as exc:
+            raise UserAlreadyExistsError(username) from exc
+        self._forget_credentials(username)
         return UserRecord(**dict(row))
 
     def get_user_by_username(self, username: str) -> Optional[UserRecord]:
         with self.connection() as conn:
-            row = conn.execute(
-                "SELECT id, username, created_at FROM users WHERE username = ?",
-                (username,),
-            ).fetchone()
+            row = conn.execute(_SQL_SELECT_USER_BY_USERNAME, (username.lower(),)).fetchone()
         return UserRecord(**dict(row)) if row else None
 
     def get_user_by_id(self, user_id: int) -> Optional[UserRecord]:
         with self.connection() as conn:
-            row = conn.execute(
-                "SELECT id, username, created_at FROM users WHERE id = ?",
-                (user_id,),
-            ).fetchone()
+            row = conn.execute(_SQL_SELECT_USER_BY_ID, (user_id,)).fetchone()
         return UserRecord(**dict(row)) if row else None
 
     def verify_credentials(self, username: str, password: str) -> Optional[UserRecord]:
-        password_hash = self._hash_password(password)
+        credentials = self._stored_credentials(username)
+        if credentials is None:
+            return None
+        record, stored_hash, salt = credentials
+        if not hmac.compare_digest(stored_hash, self._hash_password(password, salt)):
+            return None
+        if salt is None:
+            self._upgrade_password(record, password)
+        return record
+
+    def _upgrade_password(self, record: UserRecord, password: str) -> None:
+        """Re-hash a legacy unsalted password with PBKDF2 once it has been verified."""
+        salt = secrets.token_bytes(16)
+        password_hash = self._hash_password(password, salt)
+        with self.transaction() as conn:
+            conn.execute(_SQL_UPDATE_PASSWORD, (password_hash, salt, record.id))
+        self._forget_credentials(record.username)
+
+    def _stored_credentials(self, username: str) -> Optional[Tuple[UserRecord, str, Optional[bytes]]]:
+        now = time.monotonic()
+        key = username.lower()
+        with self._credentials_lock:
+            entry = self._credentials.get(key)
+            if entry is not None and entry[0] > now:
+                self._credentials.move_to_end(key)
+                return entry[1], entry[2], entry[3]
         with self.connection() as conn:
-            row = conn.execute(
-                "SELECT id, username, created_at FROM users WHERE username = ? AND password_hash = ?",
-                (username, password_hash),
-            ).fetchone()
-        return UserRecord(**dict(row)) if row else None
+            row = conn.execute(_SQL_SELECT_CREDENTIALS, (key,)).fetchone()
+        if row is None:
+            # Unknown users are not cached so a later registration is seen at once.
+            return None
+        record = UserRecord(id=row["id"], username=row["username"], created_at=row["created_at"])
+        salt = bytes(row["salt"]) if row["salt"] is not None else None
+        with self._credentials_lock:
+            self._credentials[key] = (now + self.CREDENTIALS_TTL_S, record, row["password_hash"], salt)
+            self._credentials.move_to_end(key)
+            while len(self._credentials) > self.CREDENTIALS_CACHE_SIZE:
+                self._credentials.popitem(last=False)
+        return record, row["password_hash"], salt
+
+    def _forget_credentials(self, username: str) -> None:
+        with self._credentials_lock:
+            self._credentials.pop(username.lower(), None)
 
-    def store_chat_message(self, user_id: int, message: str) -> ChatRecord:
-        with self.connection() as conn:
-            cursor = conn.execute(
-                "INSERT INTO chats (user_id, message) VALUES (?, ?)",
-                (user_id, message),
-            )
+    @staticmethod
+    def _db_timestamp() -> str:
+        """Current UTC time in the same format as SQLite's ``DATETIME('now')``."""
+        return datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+
+    def store_chat_message(self, user_id: int, username: str, message: str) -> ChatRecord:
+        created_at = self._db_timestamp()
+        with self.transaction() as conn:
+            cursor = conn.execute(_SQL_INSERT_CHAT, (user_id, message, created_at))
             chat_id = cursor.lastrowid
-            conn.commit()
-            row = conn.execute(
-                """
-                SELECT chats.id, chats.user_id, users.username, chats.message, chats.created_at
-                FROM chats
-                JOIN users ON users.id = chats.user_id
-                WHERE chats.id = ?
-                """,
-                (chat_id,),
-            ).fetchone()
-        if row is None:
-            raise RuntimeError("No se pudo recuperar el mensaje recién insertado")
-        return ChatRecord(**dict(row))
+        return ChatRecord(id=chat_id, user_id=user_id, username=username, message=message, created_at=created_at)
+
+    async def store_chat_message_async(self, user_id: int, username: str, message: str) -> ChatRecord:
+        """Queue a chat insert that is committed together with concurrent ones."""
+        loop = asyncio.get_running_loop()
+        if self._chat_writer is None or self._chat_writer.done() or self._chat_loop is not loop:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+            self._chat_queue = asyncio.Queue()
+            self._chat_loop = loop
+            self._chat_writer = loop.create_task(self._drain_chat_queue(self._chat_queue))
+        future = loop.create_future()
+        await self._chat_queue.put((user_id, username, message, future))
+        return await future
+
+    async def _drain_chat_queue(self, pending: "asyncio.Queue[Tuple[int, str, str, asyncio.Future]]") -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await pending.get()]
+            try:
+                await asyncio.sleep(self.CHAT_BATCH_WINDOW_S)
+                while len(batch) < self.CHAT_BATCH_SIZE and not pending.empty():
+                    batch.append(pending.get_nowait())
+                await self._write_chat_batch(loop, batch)
+            except asyncio.CancelledError:
+                # Stopped by ``close()``: nobody is left to deliver this batch's results.
+                self._fail_chat_items(batch)
+                raise
+            finally:
+                # ``aclose`` joins the queue, so mark items done only once resolved.
+                for _ in batch:
+                    pending.task_done()
+
+    async def _write_chat_batch(
+        self, loop: asyncio.AbstractEventLoop, batch: List[Tuple[int, str, str, asyncio.Future]]
+    ) -> None:
+        rows = [(user_id, username, message) for user_id, username, message, _ in batch]
+        try:
+            records = await loop.run_in_executor(self._writer, self._insert_chat_batch, rows)
+        except sqlite3.Error:
+            # Retry one by one so a single bad row does not fail the whole batch.
+            for user_id, username, message, future in batch:
+                try:
+                    record = await loop.run_in_executor(
+                        self._writer, self.store_chat_message, user_id, username, message
+                    )
+                except Exception as exc:  # pylint: disable=broad-except
+                    if not future.done():
+                        future.set_exception(exc)
+                else:
+                    if not future.done():
+                        future.set_result(record)
+            return
+        except Exception as exc:  # pylint: disable=broad-except
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (*_, future), record in zip(batch, records):
+            if not future.done():
+                future.set_result(record)
+
+    def _insert_chat_batch(self, rows: Sequence[Tuple[int, str, str]]) -> List[ChatRecord]:
+        created_at = self._db_timestamp()
+        # One transaction, so still one commit per batch; each row reports its own id
+        # rather than the batch inferring them from sqlite_sequence.
+        with self.transaction() as conn:
+            chat_ids = [
+                conn.execute(_SQL_INSERT_CHAT, (user_id, message, created_at)).lastrowid
+                for user_id, _, message in rows
+            ]
+        return [
+            ChatRecord(id=chat_id, user_id=user_id, username=username, message=message, created_at=created_at)
+            for chat_id, (user_id, username, message) in zip(chat_ids, rows)
+        ]
 
     def list_chat_messages(self, limit: int = 50) -> List[ChatRecord]:
         limit = max(1, min(limit, 500))
         with self.connection() as conn:
-            rows = conn.execute(
-                """
-                SELECT chats.id, chats.user_id, users.username, chats.message, chats.created_at
-                FROM chats
-                JOIN users ON users.id = chats.user_id
-                ORDER BY chats.created_at DESC, chats.id DESC
-                LIMIT ?
-                """,
-                (limit,),
-            ).fetchall()
-        return [ChatRecord(**dict(row)) for row in rows][::-1]
+            rows = conn.execute(_SQL_LIST_CHATS, (limit,)).fetchall()
+        return [ChatRecord(**dict(row)) for row in rows]
+
+    def list_chat_messages_json(self, limit: int = 50) -> str:
+        """Like ``list_chat_messages`` but returns the JSON array built by SQLite."""
+        limit = max(1, min(limit, 500))
+        with self.connection() as conn:
+            (payload,) = conn.execute(_SQL_LIST_CHATS_JSON, (limit,)).fetchone()
+        return payload
 
     def count_users(self) -> int:
         with self.connection() as conn:
-            (count,) = conn.execute("SELECT COUNT(*) FROM users").fetchone()
+            (count,) = conn.execute(_SQL_COUNT_USERS).fetchone()
         return int(count)
 
 
@@ -202,49 +530,233 @@ class DatabaseGateway:
 
 
 class OGSStore:
-    """Manages the JSON file where ground stations are persisted."""
+    """Manages the JSON file where ground stations are persisted.
+
+    Single-station changes are appended to a ``.journal.jsonl`` file next to the
+    JSON document instead of rewriting it; the journal is replayed on load and
+    folded back into the document once it grows past ``COMPACT_AFTER`` entries.
+    """
+
+    COMPACT_AFTER = 256
+    # How long ``list()`` serves a snapshot before the files are stat'ed again.  It
+    # only delays readers seeing edits from other processes: every mutation
+    # revalidates first, so it never builds on a stale snapshot.
+    REVALIDATE_S = 1.0
 
     def __init__(self, data_path: Path) -> None:
         self.data_path = data_path
+        self.journal_path = data_path.with_suffix(".journal.jsonl")
+        # Parsed file contents, reused until the file's mtime/size changes on disk.
+        # Kept as an immutable snapshot so readers can share it without copying.
+        self._cache: Optional[Tuple[Dict[str, Any], ...]] = None
+        self._cache_signature: Optional[Tuple[int, ...]] = None
+        # First index of each station id in ``_cache``, built lazily and kept in step
+        # by ``upsert`` so repeated inserts skip a linear scan.
+        self._positions: Optional[Dict[Any, int]] = None
+        self._journal_entries = 0
+        self._validated_at = float("-inf")
+        self._lock = threading.RLock()
         if not self.data_path.exists():
             self.data_path.write_text("[]", encoding="utf-8")
 
-    def _read(self) -> List[Dict[str, Any]]:
-        with self.data_path.open("r", encoding="utf-8") as handle:
-            return json.load(handle)
+    def _signature(self) -> Tuple[int, ...]:
+        stat = self.data_path.stat()
+        try:
+            journal = self.journal_path.stat()
+        except FileNotFoundError:
+            return stat.st_mtime_ns, stat.st_size, 0, -1
+        return stat.st_mtime_ns, stat.st_size, journal.st_mtime_ns, journal.st_size
+
+    def _read(self, fresh: bool = False) -> Tuple[Dict[str, Any], ...]:
+        """Return the current snapshot; ``fresh`` skips the revalidation window."""
+        with self._lock:
+            now = time.monotonic()
+            if not fresh and self._cache is not None and now - self._validated_at < self.REVALIDATE_S:
+                return self._cache
+            self._validated_at = now
+            signature = self._signature()
+            if self._cache is None or signature != self._cache_signature:
+                data = self._load_document(self.data_path)
+                changed = self._normalise(data)
+                entries, torn = self._replay_journal(data)
+                # A torn line would swallow the next append, so rewrite instead.
+                if changed or torn or entries >= self.COMPACT_AFTER:
+                    self._write(data)
+                else:
+                    self._cache = tuple(data)
+                    self._positions = None
+                    self._cache_signature = signature
+                    self._journal_entries = entries
+            return self._cache
 
-    def _write(self, data: List[Dict[str, Any]]) -> None:
-        with self.data_path.open("w", encoding="utf-8") as handle:
-            json.dump(data, handle, ensure_ascii=False, indent=2)
+    @staticmethod
+    def _load_document(path: Path) -> List[Dict[str, Any]]:
+        """Parse the JSON document straight from a read-only mapping of the file."""
+        with path.open("rb") as handle:
+            try:
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped; let orjson report them as usual.
+                return orjson.loads(handle.read())
+            with mapped, memoryview(mapped) as view:
+                return orjson.loads(view)
+
+    def _replay_journal(self, data: List[Dict[str, Any]]) -> Tuple[int, bool]:
+        """Apply the journal to ``data`` in place; return its entry count and whether a line was torn."""
+        try:
+            lines = self.journal_path.read_bytes().splitlines()
+        except FileNotFoundError:
+            return 0, False
+        torn = False
+        positions: Dict[Any, int] = {}
+        for idx, record in enumerate(data):
+            positions.setdefault(record.get("id"), idx)
+        for line in lines:
+            try:
+                entry = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # A torn final line from an interrupted append.
+                torn = True
+                continue
+            if entry.get("op") == "delete":
+                data[:] = [item for item in data if item.get("id") != entry["id"]]
+                positions = {}
+                for idx, record in enumerate(data):
+                    positions.setdefault(record.get("id"), idx)
+                continue
+            record = entry["record"]
+            idx = positions.get(record["id"])
+            if idx is None:
+                positions[record["id"]] = len(data)
+                data.append(record)
+            else:
+                data[idx] = record
+        return len(lines), torn
+
+    def _append_journal(self, entry: Dict[str, Any], data: Sequence[Dict[str, Any]]) -> None:
+        """Journal ``entry``, whose effect on the freshly read snapshot is ``data``."""
+        with self._lock:
+            loaded = self._cache_signature
+            line = orjson.dumps(entry) + b"\n"
+            with self.journal_path.open("ab") as handle:
+                handle.write(line)
+            self._journal_entries += 1
+            signature = self._signature()
+            # Adopt the new signature only when the journal grew by exactly this line
+            # on top of the files that were loaded.  Anything else means another
+            # writer got in between, so reload and replay its entries with ours.
+            if loaded is not None and signature[:2] == loaded[:2] and signature[3] == max(loaded[3], 0) + len(line):
+                self._cache = tuple(data)
+                self._cache_signature = signature
+            else:
+                self._cache_signature = None
+                data = self._read(fresh=True)
+            if self._journal_entries >= self.COMPACT_AFTER:
+                self._write(data)
 
-    def list(self) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _normalise(data: List[Dict[str, Any]]) -> bool:
+        """Fill in missing apertures and ids in place; return whether anything changed."""
+        changed = False
+        for idx, record in enumerate(data):
+            if "aperture_m" not in record or not isinstance(record["aperture_m"], (int, float)):
+                record["aperture_m"] = 1.0
+                changed = True
+            if not record.get("id"):
+                record["id"] = f"station-{secrets.token_hex(4)}-{idx}"
+                changed = True
+        return changed
+
+    def _write(self, data: Sequence[Dict[str, Any]]) -> None:
+        encoded = orjson.dumps(list(data), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        with self._lock:
+            # Write a sibling temp file and rename it over the original so a crash
+            # never leaves a truncated store behind.  The data is fsync'ed before the
+            # rename so the new name can never point at unwritten blocks.
+            with NamedTemporaryFile(
+                "wb", dir=self.data_path.parent, prefix=".ogs-", suffix=".tmp", delete=False
+            ) as handle:
+                handle.write(encoded)
+                handle.flush()
+                os.fsync(handle.fileno())
+                tmp_path = Path(handle.name)
+            try:
+                try:
+                    os.chmod(tmp_path, self.data_path.stat().st_mode & 0o777)
+                except FileNotFoundError:
+                    pass
+                os.replace(tmp_path, self.data_path)
+            except OSError:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            # The document now contains every journalled change; replaying a journal
+            # left behind by a crash right here is harmless since entries are idempotent.
+            self.journal_path.unlink(missing_ok=True)
+            self._journal_entries = 0
+            self._cache = tuple(data)
+            self._positions = None
+            self._cache_signature = self._signature()
+
+    def list(self) -> Sequence[Dict[str, Any]]:
+        """Return the current stations; the records are shared and must not be mutated."""
         return self._read()
 
+    def migrate(self) -> None:
+        """Backfill missing ids/apertures and fold in the journal once, at startup."""
+        with self._lock:
+            self._cache = None
+            self._read()
+
+    def compact(self) -> None:
+        """Fold any journalled changes back into the JSON document."""
+        with self._lock:
+            data = self._read(fresh=True)
+            if self._journal_entries:
+                self._write(data)
+
     def overwrite(self, payload: List[Dict[str, Any]]) -> None:
-        self._write(payload)
+        data = [dict(item) for item in payload]
+        self._normalise(data)
+        self._write(data)
 
     def upsert(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        data = self._read()
-        identifier = payload.get("id") or f"station-{uuid4().hex[:8]}"
+        identifier = payload.get("id") or f"station-{secrets.token_hex(4)}"
         payload = {**payload, "id": identifier}
-        for idx, record in enumerate(data):
-            if record.get("id") == identifier:
-                data[idx] = payload
-                self._write(data)
-                return payload
-        data.append(payload)
-        self._write(data)
+        with self._lock:
+            data = list(self._read(fresh=True))
+            if self._positions is None:
+                self._positions = {}
+                for idx, record in enumerate(data):
+                    self._positions.setdefault(record.get("id"), idx)
+            positions = self._positions
+            idx = positions.get(identifier)
+            try:
+                if idx is None:
+                    positions[identifier] = len(data)
+                    data.append(payload)
+                else:
+                    data[idx] = payload
+                self._append_journal({"op": "upsert", "record": payload}, data)
+            except BaseException:
+                self._positions = None
+                raise
         return payload
 
     def delete_all(self) -> None:
-        self._write([])
+        with self._lock:
+            # Already empty on disk: skip the rewrite and its fsync.
+            if not self._read(fresh=True) and not self._journal_entries:
+                return
+            self._write([])
 
     def delete(self, station_id: str) -> bool:
-        data = self._read()
-        filtered = [item for item in data if item.get("id") != station_id]
-        if len(filtered) == len(data):
-            return False
-        self._write(filtered)
+        with self._lock:
+            data = self._read(fresh=True)
+            filtered = [item for item in data if item.get("id") != station_id]
+            if len(filtered) == len(data):
+                return False
+            self._positions = None
+            self._append_journal({"op": "delete", "id": station_id}, filtered)
         return True
 
 
@@ -265,6 +777,14 @@ class AtmosphereModelNotFoundError(AtmosphereModelError):
     pass
 
 
+def _format_date_key(ts: datetime) -> str:
+    return f"{ts.year:04d}-{ts.month:02d}-{ts.day:02d}"
+
+
+def _format_hour_key(ts: datetime) -> str:
+    return f"{ts.year:04d}-{ts.month:02d}-{ts.day:02d}T{ts.hour:02d}:00"
+
+
 @dataclass(frozen=True)
 class AtmosphereQuery:
     lat: float
@@ -274,6 +794,13 @@ class AtmosphereQuery:
     ground_cn2_day: float
     ground_cn2_night: float
     wavelength_nm: float
+    _hour_key: str = field(init=False, repr=False, compare=False)
+    _date_key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Cache keys are read on every fetch; format them once per query.
+        object.__setattr__(self, "_hour_key", _format_hour_key(self.timestamp))
+        object.__setattr__(self, "_date_key", _format_date_key(self.timestamp))
 
     @property
     def is_day(self) -> bool:
@@ -285,20 +812,55 @@ class AtmosphereQuery:
 
     @property
     def hour_key(self) -> str:
-        return self.timestamp.strftime("%Y-%m-%dT%H:00")
+        return self._hour_key
 
     @property
     def date_key(self) -> str:
-        return self.timestamp.strftime("%Y-%m-%d")
+        return self._date_key
 
 
 @dataclass
-class AtmosphericLayer:
-    alt_km: float
-    cn2: Optional[float] = None
-    wind_mps: Optional[float] = None
-    temperature_k: Optional[float] = None
-    humidity: Optional[float] = None
+class LayerArrays:
+    """Column-oriented layer samples; NaN marks a missing value within a column."""
+
+    alt_km: np.ndarray
+    cn2: np.ndarray
+    wind_mps: np.ndarray
+    temperature_k: Optional[np.ndarray] = None
+    humidity: Optional[np.ndarray] = None
+
+    def __post_init__(self) -> None:
+        self.alt_km = np.asarray(self.alt_km, dtype=np.float64)
+        self.cn2 = np.asarray(self.cn2, dtype=np.float64)
+        self.wind_mps = np.asarray(self.wind_mps, dtype=np.float64)
+        if self.temperature_k is not None:
+            self.temperature_k = np.asarray(self.temperature_k, dtype=np.float64)
+        if self.humidity is not None:
+            self.humidity = np.asarray(self.humidity, dtype=np.float64)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        columns = [
+            (name, values)
+            for name, values in (
+                ("alt_km", self.alt_km),
+                ("cn2", self.cn2),
+                ("wind_mps", self.wind_mps),
+                ("temperature_k", self.temperature_k),
+                ("humidity", self.humidity),
+            )
+            if values is not None
+        ]
+        names = [name for name, _ in columns]
+        rows = zip(*(values.tolist() for _, values in columns))
+        finite = [np.isfinite(values) for _, values in columns]
+        if all(column.all() for column in finite):
+            return [dict(zip(names, row)) for row in rows]
+        # Only columns with gaps pay for the per-value presence check.
+        masks = zip(*(column.tolist() for column in finite))
+        return [
+            {name: value for name, value, present in zip(names, row, mask) if present}
+            for row, mask in zip(rows, masks)
+        ]
 
 
 @dataclass
@@ -319,7 +881,7 @@ class AtmosphericProfile:
     status: str
     timestamp: str
     summary: AtmosphericSummary
-    layers: List[AtmosphericLayer]
+    layers: LayerArrays
     sources: Dict[str, Any]
     metadata: Dict[str, Any]
 
@@ -328,84 +890,579 @@ class AtmosphericProfile:
             "model": self.model,
             "status": self.status,
             "timestamp": self.timestamp,
-            "summary": _clean_dict(asdict(self.summary)),
-            "layers": [_clean_dict(asdict(layer)) for layer in self.layers],
+            "summary": {key: value for key, value in self.summary.__dict__.items() if value is not None},
+            "layers": self.layers.to_records(),
             "sources": self.sources,
             "metadata": self.metadata,
         }
 
 
+_RETRY_TOTAL = 3
+_RETRY_BACKOFF_S = 0.2
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Shared HTTP session so cache misses reuse pooled keep-alive connections.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=_RETRY_TOTAL, backoff_factor=_RETRY_BACKOFF_S, status_forcelist=_RETRY_STATUSES),
+    ),
+)
+
+# Created on first use inside the server's event loop and closed on shutdown.
+_ASYNC_SESSION: Optional["httpx.AsyncClient"] = None
+
+
+def _async_session() -> "httpx.AsyncClient":
+    global _ASYNC_SESSION
+    if _ASYNC_SESSION is None:
+        limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        try:
+            transport = httpx.AsyncHTTPTransport(http2=True, retries=_RETRY_TOTAL, limits=limits)
+        except ImportError:  # HTTP/2 needs the optional ``h2`` package.
+            transport = httpx.AsyncHTTPTransport(retries=_RETRY_TOTAL, limits=limits)
+        _ASYNC_SESSION = httpx.AsyncClient(transport=transport, timeout=10.0)
+    return _ASYNC_SESSION
+
+
+async def close_async_session() -> None:
+    global _ASYNC_SESSION
+    session, _ASYNC_SESSION = _ASYNC_SESSION, None
+    if session is not None:
+        await session.aclose()
+
+
 class OpenMeteoClient:
     BASE_URL = "https://api.open-meteo.com/v1/forecast"
 
-    def fetch_hourly(self, query: AtmosphereQuery, variables: Sequence[str]) -> Dict[str, Any]:
+    def fetch_hourly(self, query: AtmosphereQuery, variables: Sequence[str]) -> Mapping[str, Any]:
         if not variables:
             raise AtmosphereProviderError("No variables requested for Open-Meteo fetch")
         variable_tuple = tuple(sorted(set(variables)))
         lat_key = round(query.lat, 3)
         lon_key = round(query.lon, 3)
-        raw = _fetch_open_meteo_cached(lat_key, lon_key, query.date_key, variable_tuple)
-        return copy.deepcopy(raw)
+        # The cached dataset is a read-only view over read-only arrays, so it is shared as-is.
+        return _fetch_open_meteo_cached(lat_key, lon_key, query.date_key, variable_tuple)
+
+    def fetch_hourly_many(
+        self,
+        queries: Sequence[AtmosphereQuery],
+        variables: Sequence[str],
+    ) -> List[Mapping[str, Any]]:
+        """Like :meth:`fetch_hourly` for many locations; cache misses are fetched in bulk requests."""
+        if not variables:
+            raise AtmosphereProviderError("No variables requested for Open-Meteo fetch")
+        variable_tuple = tuple(sorted(set(variables)))
+        keys = [
+            (round(query.lat, 3), round(query.lon, 3), query.date_key, variable_tuple)
+            for query in queries
+        ]
+        return _fetch_open_meteo_many(keys)
+
+    async def fetch_hourly_many_async(
+        self,
+        queries: Sequence[AtmosphereQuery],
+        variables: Sequence[str],
+    ) -> List[Mapping[str, Any]]:
+        """Like :meth:`fetch_hourly_many`, downloading the misses on the event loop."""
+        if not variables:
+            raise AtmosphereProviderError("No variables requested for Open-Meteo fetch")
+        variable_tuple = tuple(sorted(set(variables)))
+        keys = [
+            (round(query.lat, 3), round(query.lon, 3), query.date_key, variable_tuple)
+            for query in queries
+        ]
+        return await _fetch_open_meteo_many_async(keys)
+
+    def __reduce__(self):
+        # A worker process unpickles the shared client as its own ``_CLIENT``, so
+        # its module-level caches still apply to services shipped to it.
+        if self is _CLIENT:
+            return "_CLIENT"
+        return super().__reduce__()
+
+
+# The client is stateless, so a single instance is shared by every service.
+_CLIENT = OpenMeteoClient()
+
+
+class OpenMeteoCache:
+    """Two-tier TTL cache for Open-Meteo datasets.
+
+    L1 keeps parsed, read-only datasets in process memory; L2 keeps the raw JSON
+    in a SQLite file so restarts and sibling workers skip the network as well.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl: timedelta,
+        memory_entries: int = 1024,
+        size_limit_bytes: int = 2 ** 30,
+    ) -> None:
+        self.db_path = db_path
+        self.ttl_seconds = ttl.total_seconds()
+        self.memory_entries = memory_entries
+        self.size_limit_bytes = size_limit_bytes
+        self._memory: "OrderedDict[Tuple[Any, ...], Tuple[float, Mapping[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Mapping[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return entry[1]
+                del self._memory[key]
+        stored = self._disk_get(key, now)
+        if stored is None:
+            return None
+        expires_at, raw = stored
+        dataset = _parse_open_meteo(raw)
+        self._remember(key, expires_at, dataset)
+        return dataset
+
+    def get_many(self, keys: Sequence[Tuple[Any, ...]]) -> Dict[Tuple[Any, ...], Mapping[str, Any]]:
+        """Look up several keys, reading every L1 miss from disk in batched queries."""
+        now = time.time()
+        found: Dict[Tuple[Any, ...], Mapping[str, Any]] = {}
+        misses: List[Tuple[Any, ...]] = []
+        with self._lock:
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None and entry[0] > now:
+                    self._memory.move_to_end(key)
+                    found[key] = entry[1]
+                else:
+                    self._memory.pop(key, None)
+                    misses.append(key)
+        if misses:
+            for key, (expires_at, raw) in self._disk_get_many(misses, now).items():
+                dataset = _parse_open_meteo(raw)
+                self._remember(key, expires_at, dataset)
+                found[key] = dataset
+        return found
+
+    def put(self, key: Tuple[Any, ...], raw: bytes) -> Mapping[str, Any]:
+        return self.put_many([(key, raw)])[0]
+
+    def put_many(self, items: Sequence[Tuple[Tuple[Any, ...], bytes]]) -> List[Mapping[str, Any]]:
+        """Store several payloads, writing them to disk in a single transaction."""
+        datasets = [_parse_open_meteo(raw) for _, raw in items]
+        expires_at = time.time() + self.ttl_seconds
+        self._disk_put(items, expires_at)
+        for (key, _), dataset in zip(items, datasets):
+            self._remember(key, expires_at, dataset)
+        return datasets
+
+    def _remember(self, key: Tuple[Any, ...], expires_at: float, dataset: Mapping[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = (expires_at, dataset)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    @staticmethod
+    def _key_text(key: Tuple[Any, ...]) -> str:
+        return orjson.dumps(key).decode("utf-8")
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.db_path, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL;")
+                conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS open_meteo_cache (
+                        key TEXT PRIMARY KEY,
+                        expires_at REAL NOT NULL,
+                        payload BLOB NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS ix_open_meteo_cache_expires ON open_meteo_cache(expires_at);
+                    """
+                )
+            except (OSError, sqlite3.Error):
+                # The disk tier is best effort; fall back to the in-memory tier only.
+                return None
+            self._local.conn = conn
+        return conn
+
+    def _disk_get(self, key: Tuple[Any, ...], now: float) -> Optional[Tuple[float, bytes]]:
+        conn = self._connection()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT expires_at, payload FROM open_meteo_cache WHERE key = ? AND expires_at > ?",
+                (self._key_text(key), now),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return (row[0], bytes(row[1])) if row else None
+
+    # Stays under SQLite's historical 999 bound-parameter limit.
+    _DISK_BATCH = 500
+
+    def _disk_get_many(
+        self, keys: Sequence[Tuple[Any, ...]], now: float
+    ) -> Dict[Tuple[Any, ...], Tuple[float, bytes]]:
+        conn = self._connection()
+        if conn is None:
+            return {}
+        by_text = {self._key_text(key): key for key in keys}
+        texts = list(by_text)
+        found: Dict[Tuple[Any, ...], Tuple[float, bytes]] = {}
+        try:
+            for start in range(0, len(texts), self._DISK_BATCH):
+                batch = texts[start:start + self._DISK_BATCH]
+                rows = conn.execute(
+                    "SELECT key, expires_at, payload FROM open_meteo_cache "
+                    f"WHERE expires_at > ? AND key IN ({','.join('?' * len(batch))})",
+                    (now, *batch),
+                ).fetchall()
+                for text, expires_at, payload in rows:
+                    found[by_text[text]] = (expires_at, bytes(payload))
+        except sqlite3.Error:
+            pass  # Keep whatever was read; the rest is refetched from the network.
+        return found
+
+    def _disk_put(self, items: Sequence[Tuple[Tuple[Any, ...], bytes]], expires_at: float) -> None:
+        conn = self._connection()
+        if conn is None:
+            return
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM open_meteo_cache WHERE expires_at <= ?", (time.time(),))
+            conn.executemany(
+                "INSERT OR REPLACE INTO open_meteo_cache (key, expires_at, payload) VALUES (?, ?, ?)",
+                [(self._key_text(key), expires_at, raw) for key, raw in items],
+            )
+            (stored_bytes,) = conn.execute("SELECT COALESCE(SUM(LENGTH(payload)), 0) FROM open_meteo_cache").fetchone()
+            if stored_bytes > self.size_limit_bytes:
+                # Over budget: drop the quarter of entries closest to expiry.
+                conn.execute(
+                    """
+                    DELETE FROM open_meteo_cache WHERE key IN (
+                        SELECT key FROM open_meteo_cache ORDER BY expires_at
+                        LIMIT MAX(1, (SELECT COUNT(*) FROM open_meteo_cache) / 4)
+                    )
+                    """
+                )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+
+
+_OPEN_METEO_CACHE = OpenMeteoCache(
+    Path(__file__).resolve().parent / "data" / "openmeteo_cache.sqlite3",
+    # Open-Meteo refreshes its forecast runs roughly every six hours.
+    ttl=timedelta(hours=6),
+    # A full weather field is up to ~900 datasets, so keep several variables,
+    # levels or days of them hot rather than just the latest one.
+    memory_entries=4096,
+)
 
 
-@lru_cache(maxsize=128)
 def _fetch_open_meteo_cached(
     lat_key: float,
     lon_key: float,
     date_key: str,
     variable_tuple: Tuple[str, ...],
-) -> Dict[str, Any]:
-    params = {
-        "latitude": lat_key,
-        "longitude": lon_key,
+) -> Mapping[str, Any]:
+    key = (lat_key, lon_key, date_key, variable_tuple)
+    dataset = _OPEN_METEO_CACHE.get(key)
+    if dataset is None:
+        dataset = _OPEN_METEO_CACHE.put(key, _download_open_meteo(lat_key, lon_key, date_key, variable_tuple))
+    return dataset
+
+
+# Locations per bulk request, which keeps the query string well within URL limits.
+_OPEN_METEO_BULK_LIMIT = 100
+
+# (lat, lon, date, variables) cache key of one Open-Meteo dataset.
+_OpenMeteoKey = Tuple[float, float, str, Tuple[str, ...]]
+
+
+def _missing_chunks(
+    keys: Sequence[_OpenMeteoKey], datasets: Mapping[_OpenMeteoKey, Any]
+) -> List[List[_OpenMeteoKey]]:
+    """Group the uncached keys by date and variables into bulk-request sized chunks."""
+    missing: Dict[Tuple[str, Tuple[str, ...]], List[_OpenMeteoKey]] = {}
+    for key in keys:
+        if key not in datasets:
+            missing.setdefault((key[2], key[3]), []).append(key)
+    return [
+        group[start:start + _OPEN_METEO_BULK_LIMIT]
+        for group in missing.values()
+        for start in range(0, len(group), _OPEN_METEO_BULK_LIMIT)
+    ]
+
+
+def _fetch_open_meteo_many(keys: Sequence[_OpenMeteoKey]) -> List[Mapping[str, Any]]:
+    unique_keys = list(dict.fromkeys(keys))
+    datasets = _OPEN_METEO_CACHE.get_many(unique_keys)
+    chunks = _missing_chunks(unique_keys, datasets)
+
+    def _download(chunk: List[_OpenMeteoKey]) -> List[Tuple[_OpenMeteoKey, Mapping[str, Any]]]:
+        # Each worker parses and persists its own chunk, so the cache writes fan out
+        # with the downloads instead of queueing one transaction per location.
+        _, _, date_key, variable_tuple = chunk[0]
+        payloads = _download_open_meteo_bulk([(key[0], key[1]) for key in chunk], date_key, variable_tuple)
+        return list(zip(chunk, _OPEN_METEO_CACHE.put_many(list(zip(chunk, payloads)))))
+
+    downloaded = map(_download, chunks) if len(chunks) == 1 else _FETCH_EXECUTOR.map(_download, chunks)
+    for results in downloaded:
+        datasets.update(results)
+    return [datasets[key] for key in keys]
+
+
+async def _fetch_open_meteo_many_async(keys: Sequence[_OpenMeteoKey]) -> List[Mapping[str, Any]]:
+    """Async twin of :func:`_fetch_open_meteo_many`: only the SQLite cache work runs in threads."""
+    unique_keys = list(dict.fromkeys(keys))
+    datasets = await run_in_threadpool(_OPEN_METEO_CACHE.get_many, unique_keys)
+    chunks = _missing_chunks(unique_keys, datasets)
+
+    async def _download(chunk: List[_OpenMeteoKey]) -> List[Tuple[_OpenMeteoKey, Mapping[str, Any]]]:
+        _, _, date_key, variable_tuple = chunk[0]
+        raw = await _download_open_meteo_async(*_bulk_coordinates(chunk), date_key, variable_tuple)
+        payloads = _split_open_meteo_bulk(raw, len(chunk))
+        return list(zip(chunk, await run_in_threadpool(_OPEN_METEO_CACHE.put_many, list(zip(chunk, payloads)))))
+
+    for results in await asyncio.gather(*(_download(chunk) for chunk in chunks)):
+        datasets.update(results)
+    return [datasets[key] for key in keys]
+
+
+def _bulk_coordinates(coordinates: Sequence[Tuple[float, ...]]) -> Tuple[str, str]:
+    """Comma-joined latitude and longitude parameters for a bulk request."""
+    return ",".join(str(item[0]) for item in coordinates), ",".join(str(item[1]) for item in coordinates)
+
+
+def _download_open_meteo_bulk(
+    coordinates: Sequence[Tuple[float, float]],
+    date_key: str,
+    variable_tuple: Tuple[str, ...],
+) -> List[bytes]:
+    """Download several locations in one request and split the reply into per-location payloads."""
+    raw = _download_open_meteo(*_bulk_coordinates(coordinates), date_key, variable_tuple)
+    return _split_open_meteo_bulk(raw, len(coordinates))
+
+
+def _split_open_meteo_bulk(raw: bytes, expected: int) -> List[bytes]:
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError as exc:
+        raise AtmosphereProviderError("Open-Meteo returned an invalid JSON payload") from exc
+    # A single location comes back as an object rather than a list.
+    locations = data if isinstance(data, list) else [data]
+    if len(locations) != expected:
+        raise AtmosphereProviderError("Open-Meteo bulk response does not match the requested locations")
+    return [orjson.dumps(location) for location in locations]
+
+
+def _download_open_meteo(
+    latitude: Any,
+    longitude: Any,
+    date_key: str,
+    variable_tuple: Tuple[str, ...],
+) -> bytes:
+    params = _open_meteo_params(latitude, longitude, date_key, variable_tuple)
+    try:
+        response = _SESSION.get(OpenMeteoClient.BASE_URL, params=params, timeout=10)
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        raise AtmosphereProviderError(f"Open-Meteo request failed: {exc}") from exc
+    return response.content
+
+
+async def _download_open_meteo_async(
+    latitude: Any,
+    longitude: Any,
+    date_key: str,
+    variable_tuple: Tuple[str, ...],
+) -> bytes:
+    params = _open_meteo_params(latitude, longitude, date_key, variable_tuple)
+    session = _async_session()
+    try:
+        # The transport only retries failed connects; retry throttling and server
+        # errors here with the same backoff the requests session applies.
+        for attempt in range(_RETRY_TOTAL + 1):
+            response = await session.get(OpenMeteoClient.BASE_URL, params=params)
+            if response.status_code not in _RETRY_STATUSES or attempt == _RETRY_TOTAL:
+                break
+            await asyncio.sleep(_RETRY_BACKOFF_S * 2 ** attempt)
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise AtmosphereProviderError(f"Open-Meteo request failed: {exc}") from exc
+    return response.content
+
+
+def _open_meteo_params(latitude: Any, longitude: Any, date_key: str, variable_tuple: Tuple[str, ...]) -> Dict[str, Any]:
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
         "start_date": date_key,
         "end_date": date_key,
         "timezone": "UTC",
+        "timeformat": "unixtime",
         "hourly": ",".join(variable_tuple),
     }
+
+
+def _parse_open_meteo(raw: bytes) -> Mapping[str, Any]:
     try:
-        response = requests.get(OpenMeteoClient.BASE_URL, params=params, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as exc:
-        raise AtmosphereProviderError(f"Open-Meteo request failed: {exc}") from exc
-    data = response.json()
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError as exc:
+        raise AtmosphereProviderError("Open-Meteo returned an invalid JSON payload") from exc
     if "hourly" not in data:
         raise AtmosphereProviderError("Open-Meteo response missing 'hourly' block")
-    return data
-
+    return MappingProxyType({**data, "hourly": _hourly_arrays(data["hourly"])})
 
-def _clean_dict(payload: Dict[str, Any]) -> Dict[str, Any]:
-    return {key: value for key, value in payload.items() if value is not None}
 
-
-def _resolve_hour_index(hourly_block: Dict[str, Any], hour_key: str) -> int:
+def _hourly_arrays(hourly_block: Dict[str, Any]) -> Mapping[str, Any]:
+    """Convert the JSON hourly block into read-only float arrays (``null`` -> NaN)."""
     timeline = hourly_block.get("time")
-    if not isinstance(timeline, list):
+    if not isinstance(timeline, list) or not timeline:
         raise AtmosphereProviderError("Open-Meteo hourly timeline unavailable")
+    start = int(timeline[0])
+    interval = int(timeline[1]) - start if len(timeline) > 1 else 3600
+    if interval <= 0:
+        raise AtmosphereProviderError("Open-Meteo hourly timeline is not increasing")
+    arrays: Dict[str, Any] = {"time_start": start, "interval": interval, "length": len(timeline)}
+    for key, values in hourly_block.items():
+        if key == "time" or not isinstance(values, list):
+            continue
+        series = np.array(values, dtype=np.float64)
+        series.setflags(write=False)
+        arrays[key] = series
+    return MappingProxyType(arrays)
+
+
+@lru_cache(maxsize=256)
+def _utc_epoch(timestamp: datetime) -> int:
+    """Seconds since the epoch for ``timestamp``; every cell of a weather field shares one."""
+    return calendar.timegm(timestamp.utctimetuple())
+
+
+def _resolve_hour_index(hourly_block: Mapping[str, Any], timestamp: datetime) -> int:
     try:
-        return timeline.index(hour_key)
-    except ValueError as exc:
-        raise AtmosphereProviderError(f"No Open-Meteo sample available for {hour_key}") from exc
+        start = hourly_block["time_start"]
+        interval = hourly_block["interval"]
+        length = hourly_block["length"]
+    except KeyError as exc:
+        raise AtmosphereProviderError("Open-Meteo hourly timeline unavailable") from exc
+    idx = (_utc_epoch(timestamp) - start) // interval
+    if not 0 <= idx < length:
+        raise AtmosphereProviderError(f"No Open-Meteo sample available for {timestamp:%Y-%m-%dT%H:00}")
+    return idx
+
+
+def _hourly_value(hourly_block: Mapping[str, Any], key: str, idx: int) -> Optional[float]:
+    series = hourly_block.get(key)
+    if series is None or idx >= len(series):
+        return None
+    value = float(series[idx])
+    return value if isfinite(value) else None
+
+
+def _jit(signature: str):
+    """Compile a kernel eagerly with numba when it is installed, else return it unchanged."""
+    if njit is None:
+        return lambda func: func
+    return njit(signature, cache=True, fastmath=True)
+
+
+@lru_cache(maxsize=16)
+def _wavelength_consts(wavelength_nm: float) -> Tuple[float, float, float]:
+    """Return the k^2-scaled r0, theta0 and Greenwood coefficients for ``wavelength_nm``."""
+    k = 2.0 * math.pi / (wavelength_nm * 1e-9)
+    k2 = k * k
+    return 0.423 * k2, 2.91 * k2, 0.102 * k2
+
+
+@_jit(
+    "UniTuple(float64, 7)(float64[:], float64[:], float64[:], float64[:], "
+    "float64, float64, float64, float64, float64, float64)"
+)
+def _summary_core(heights, h53, cn2, winds, c_r0, c_theta, c_fg, fallback_wind, base_loss_aod, base_loss_abs):
+    """Return (r0, fG, theta0 arcsec, wind rms, AOD loss, absorption loss, tau0 ms).
+
+    ``h53`` holds ``heights ** (5/3)`` so fixed provider grids can pass it precomputed.
+    """
+    # Provider altitudes are already ascending; only reorder unsorted input.
+    dh = heights[1:] - heights[:-1]
+    if np.any(dh < 0.0):
+        order = np.argsort(heights)
+        heights = heights[order]
+        h53 = h53[order]
+        cn2 = cn2[order]
+        winds = winds[order]
+        dh = heights[1:] - heights[:-1]
+
+    # Trapezoid rule as a weighted sum: the weights are shared by all three integrals.
+    weights = np.empty(heights.size)
+    weights[0] = 0.5 * dh[0]
+    weights[-1] = 0.5 * dh[-1]
+    weights[1:-1] = 0.5 * (dh[:-1] + dh[1:])
+    weighted_cn2 = cn2 * weights
+    integral_r0 = weighted_cn2.sum()
+    integral_theta = (weighted_cn2 * h53).sum()
+    integral_wind = (weighted_cn2 * np.abs(winds) ** (5.0 / 3.0)).sum()
+
+    r0_zenith = (c_r0 * max(integral_r0, 1e-20)) ** (-3.0 / 5.0)
+    theta0_rad = (c_theta * max(integral_theta, 1e-20)) ** (-3.0 / 5.0)
+    fG_zenith = (c_fg * max(integral_wind, 1e-30)) ** (3.0 / 5.0)
+
+    if np.any(winds != 0.0):
+        wind_rms = np.sqrt(np.mean(winds ** 2))
+    else:
+        wind_rms = fallback_wind
+
+    tau0 = 0.314 * r0_zenith / max(wind_rms, 1e-3)
+
+    cn2_scale = max(integral_r0, 1e-12)
+    loss_aod = base_loss_aod + min(1.8, 0.18 * (cn2_scale ** 0.3))
+    loss_abs = base_loss_abs + min(1.2, 0.12 * (cn2_scale ** 0.25))
+
+    return (
+        r0_zenith,
+        fG_zenith,
+        math.degrees(theta0_rad) * 3600.0,
+        wind_rms,
+        loss_aod,
+        loss_abs,
+        tau0 * 1e3,
+    )
 
 
-def _calculate_summary_from_layers(
-    layers: Iterable[AtmosphericLayer],
+def _summary_from_arrays(
+    heights_m: np.ndarray,
+    cn2: np.ndarray,
+    winds: np.ndarray,
     wavelength_nm: float,
     fallback_wind: Optional[float] = None,
     base_loss_aod: float = 0.2,
     base_loss_abs: float = 0.1,
+    h53: Optional[np.ndarray] = None,
 ) -> AtmosphericSummary:
-    heights_m = []
-    cn2_values = []
-    wind_values = []
-    for layer in layers:
-        if layer.cn2 is None:
-            continue
-        heights_m.append(layer.alt_km * 1000.0)
-        cn2_values.append(layer.cn2)
-        wind_values.append(layer.wind_mps if layer.wind_mps is not None else fallback_wind)
-
-    if len(cn2_values) < 2:
+    heights = np.asarray(heights_m, dtype=np.float64)
+    h53 = heights ** (5.0 / 3.0) if h53 is None else np.asarray(h53, dtype=np.float64)
+    cn2 = np.asarray(cn2, dtype=np.float64)
+    winds = np.asarray(winds, dtype=np.float64)
+    valid = np.isfinite(cn2)
+    if not valid.all():
+        heights, h53, cn2, winds = heights[valid], h53[valid], cn2[valid], winds[valid]
+
+    if cn2.size < 2:
         return AtmosphericSummary(
             r0_zenith=0.1,
             fG_zenith=30.0,
@@ -415,94 +1472,86 @@ def _calculate_summary_from_layers(
             loss_abs_db=base_loss_abs,
         )
 
-    heights = np.array(heights_m, dtype=float)
-    cn2 = np.array(cn2_values, dtype=float)
-    order = np.argsort(heights)
-    heights = heights[order]
-    cn2 = cn2[order]
-    winds = np.array([wind_values[idx] if wind_values[idx] is not None else 0.0 for idx in order])
-
-    k = 2.0 * math.pi / (wavelength_nm * 1e-9)
-    integral_r0 = float(np.trapz(cn2, heights))
-    integral_theta = float(np.trapz(cn2 * (heights ** (5.0 / 3.0)), heights))
-    integral_wind = float(np.trapz(cn2 * (np.abs(winds) ** (5.0 / 3.0)), heights))
-
-    r0_zenith = (0.423 * (k ** 2) * max(integral_r0, 1e-20)) ** (-3.0 / 5.0)
-    theta0_rad = (2.91 * (k ** 2) * max(integral_theta, 1e-20)) ** (-3.0 / 5.0)
-    fG_zenith = (0.102 * (k ** 2) * max(integral_wind, 1e-30)) ** (3.0 / 5.0)
-
-    if np.count_nonzero(winds) > 0:
-        wind_rms = float(np.sqrt(np.mean(winds ** 2)))
-    else:
-        wind_rms = fallback_wind or 15.0
-
-    tau0 = 0.314 * r0_zenith / max(wind_rms, 1e-3)
-
-    cn2_scale = max(integral_r0, 1e-12)
-    loss_aod = base_loss_aod + min(1.8, 0.18 * (cn2_scale ** 0.3))
-    loss_abs = base_loss_abs + min(1.2, 0.12 * (cn2_scale ** 0.25))
+    missing_wind = ~np.isfinite(winds)
+    if missing_wind.any():
+        winds = np.where(missing_wind, fallback_wind if fallback_wind is not None else 0.0, winds)
+
+    c_r0, c_theta, c_fg = _wavelength_consts(float(wavelength_nm))
+    r0_zenith, fG_zenith, theta0_arcsec, wind_rms, loss_aod, loss_abs, tau0_ms = _summary_core(
+        heights,
+        h53,
+        cn2,
+        winds,
+        c_r0,
+        c_theta,
+        c_fg,
+        float(fallback_wind or 15.0),
+        float(base_loss_aod),
+        float(base_loss_abs),
+    )
 
     return AtmosphericSummary(
         r0_zenith=float(r0_zenith),
         fG_zenith=float(fG_zenith),
-        theta0_zenith=float(math.degrees(theta0_rad) * 3600.0),
+        theta0_zenith=float(theta0_arcsec),
         wind_rms=float(wind_rms),
         loss_aod_db=float(loss_aod),
         loss_abs_db=float(loss_abs),
-        coherence_time_ms=float(tau0 * 1e3),
+        coherence_time_ms=float(tau0_ms),
     )
 
 
-def _create_layers_from_samples(
-    altitudes_km: Sequence[float],
-    cn2_func,
-    wind_model,
-    temperature_profile=None,
-    humidity_profile=None,
-) -> List[AtmosphericLayer]:
-    layers: List[AtmosphericLayer] = []
-    for alt_km in altitudes_km:
-        temperature = temperature_profile(alt_km) if temperature_profile else None
-        humidity = humidity_profile(alt_km) if humidity_profile else None
-        layers.append(
-            AtmosphericLayer(
-                alt_km=alt_km,
-                cn2=float(cn2_func(alt_km * 1000.0)),
-                wind_mps=float(wind_model(alt_km)),
-                temperature_k=temperature,
-                humidity=humidity,
-            )
-        )
-    return layers
+def _piecewise_exp_shape(
+    altitudes_km: np.ndarray,
+    breaks_km: np.ndarray,
+    inv_scales_m: np.ndarray,
+    offsets_m: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the branch index and ``exp((o_i - h) / H_i)`` for fixed altitudes.
+
+    Branch ``i`` covers ``breaks_km[i-1] <= alt < breaks_km[i]``, matching an
+    ``if alt < b0 / elif alt < b1 / ... / else`` ladder.  Only the per-branch
+    coefficient ``c_i`` depends on the query, so profiles reduce to
+    ``coefficients[branch] * shape``.
+    """
+    branch = np.searchsorted(breaks_km, altitudes_km, side="right")
+    return branch, np.exp((offsets_m[branch] - altitudes_km * 1000.0) * inv_scales_m[branch])
+
+
+_HV57_VARIABLES = ("wind_u_component_300hPa", "wind_v_component_300hPa")
+
+# Fixed altitude grid and its query-independent columns.  HV 5/7 is
+# ``c1 * (h/1e5)^10 * exp(-h/1000) + 2.7e-16 * exp(-h/1500) + A * exp(-h/100)``,
+# so each term's height dependence is evaluated once here.
+_HV57_ALT_KM = np.array((0.0, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 15.0, 20.0))
+_HV57_ALT_M = _HV57_ALT_KM * 1000.0
+_HV57_H53 = _HV57_ALT_M ** (5.0 / 3.0)
+_HV57_CN2_WIND_TERM = np.power(_HV57_ALT_M * 1e-5, 10) * np.exp(_HV57_ALT_M * -1e-3)
+_HV57_CN2_BACKGROUND = 2.7e-16 * np.exp(_HV57_ALT_M * (-1.0 / 1500.0))
+_HV57_CN2_GROUND_TERM = np.exp(_HV57_ALT_M * -1e-2)
+_HV57_WIND_SHAPE = 1.0 - np.exp(-_HV57_ALT_KM / 5.0)
 
 
 def _hv57_provider(query: AtmosphereQuery, client: OpenMeteoClient) -> AtmosphericProfile:
-    variables = ["wind_u_component_300hPa", "wind_v_component_300hPa"]
+    variables = list(_HV57_VARIABLES)
     dataset = client.fetch_hourly(query, variables)
     hourly = dataset["hourly"]
-    idx = _resolve_hour_index(hourly, query.hour_key)
+    idx = _resolve_hour_index(hourly, query.timestamp)
 
-    wind_u = hourly.get("wind_u_component_300hPa", [None])[idx]
-    wind_v = hourly.get("wind_v_component_300hPa", [None])[idx]
+    wind_u = _hourly_value(hourly, "wind_u_component_300hPa", idx)
+    wind_v = _hourly_value(hourly, "wind_v_component_300hPa", idx)
     if wind_u is None or wind_v is None:
         raise AtmosphereProviderError("Missing 300 hPa wind components for Hufnagel-Valley model")
 
-    W = float(math.sqrt(wind_u ** 2 + wind_v ** 2))
+    W = math.hypot(wind_u, wind_v)
     W = max(W, 5.0)
     A = max(query.ground_cn2, 1e-17)
 
-    def cn2_hv(h_metres: float) -> float:
-        term1 = 0.00594 * ((W / 27.0) ** 2) * (h_metres * 1e-5) ** 10 * math.exp(-h_metres / 1000.0)
-        term2 = 2.7e-16 * math.exp(-h_metres / 1500.0)
-        term3 = A * math.exp(-h_metres / 100.0)
-        return term1 + term2 + term3
-
-    def wind_profile(alt_km: float) -> float:
-        return float(max(0.0, W * (1.0 - math.exp(-alt_km / 5.0)) + 3.0))
-
-    altitudes = (0.0, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 15.0, 20.0)
-    layers = _create_layers_from_samples(altitudes, cn2_hv, wind_profile)
-    summary = _calculate_summary_from_layers(layers, query.wavelength_nm, fallback_wind=W)
+    c1 = 0.00594 * (W / 27.0) ** 2
+    cn2 = c1 * _HV57_CN2_WIND_TERM + _HV57_CN2_BACKGROUND + A * _HV57_CN2_GROUND_TERM
+    winds = np.maximum(0.0, W * _HV57_WIND_SHAPE + 3.0)
+    summary = _summary_from_arrays(_HV57_ALT_M, cn2, winds, query.wavelength_nm, fallback_wind=W, h53=_HV57_H53)
+    layers = LayerArrays(_HV57_ALT_KM, cn2, winds)
 
     return AtmosphericProfile(
         model="hufnagel-valley",
@@ -523,73 +1572,77 @@ def _hv57_provider(query: AtmosphereQuery, client: OpenMeteoClient) -> Atmospher
 # Remaining providers mirror the original implementation.
 
 
+_BUFTON_VARIABLES = (
+    "wind_u_component_300hPa",
+    "wind_v_component_300hPa",
+    "wind_u_component_500hPa",
+    "wind_v_component_500hPa",
+    "wind_u_component_850hPa",
+    "wind_v_component_850hPa",
+    "temperature_850hPa",
+)
+
+
+# Piecewise Bufton-style profile on a fixed altitude grid: branch breakpoints,
+# 1/scale heights and offsets are folded into per-layer tables at import.
+_BUFTON_ALT_KM = np.array((0.0, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 12.0))
+_BUFTON_ALT_M = _BUFTON_ALT_KM * 1000.0
+_BUFTON_H53 = _BUFTON_ALT_M ** (5.0 / 3.0)
+_BUFTON_CN2_BRANCH, _BUFTON_CN2_SHAPE = _piecewise_exp_shape(
+    _BUFTON_ALT_KM,
+    np.array((0.5, 1.5, 5.0)),
+    1.0 / np.array((60.0, 120.0, 600.0, 1500.0)),
+    np.array((0.0, 0.0, 0.0, 5000.0)),
+)
+_BUFTON_WIND_BRANCH = np.searchsorted(np.array((0.5, 1.5, 6.0)), _BUFTON_ALT_KM, side="right")
+
+
 def _bufton_provider(query: AtmosphereQuery, client: OpenMeteoClient) -> AtmosphericProfile:
-    variables = [
-        "wind_u_component_300hPa",
-        "wind_v_component_300hPa",
-        "wind_u_component_500hPa",
-        "wind_v_component_500hPa",
-        "wind_u_component_850hPa",
-        "wind_v_component_850hPa",
-        "temperature_850hPa",
-    ]
+    variables = list(_BUFTON_VARIABLES)
     dataset = client.fetch_hourly(query, variables)
     hourly = dataset["hourly"]
-    idx = _resolve_hour_index(hourly, query.hour_key)
+    idx = _resolve_hour_index(hourly, query.timestamp)
 
     def _wind_speed(key: str) -> float:
-        u = hourly.get(f"wind_u_component_{key}", [None])[idx]
-        v = hourly.get(f"wind_v_component_{key}", [None])[idx]
+        u = _hourly_value(hourly, f"wind_u_component_{key}", idx)
+        v = _hourly_value(hourly, f"wind_v_component_{key}", idx)
         if u is None or v is None:
             raise AtmosphereProviderError(f"Missing wind component for {key}")
-        return float(math.sqrt(u ** 2 + v ** 2))
+        return math.hypot(u, v)
 
     wind_300 = _wind_speed("300hPa")
     wind_500 = _wind_speed("500hPa")
     wind_850 = _wind_speed("850hPa")
 
-    temp_850 = hourly.get("temperature_850hPa", [None])[idx]
+    temp_850 = _hourly_value(hourly, "temperature_850hPa", idx)
     lapse_correction = 0.8 if temp_850 is None else max(0.5, min(1.5, (temp_850 + 273.15) / 290.0))
 
     A = max(query.ground_cn2, 1e-17)
     shear_factor = max(0.5, min(2.5, abs(wind_500 - wind_850) / 10.0))
 
-    def cn2_bufton(h_metres: float) -> float:
-        h_km = h_metres / 1000.0
-        if h_km < 0.5:
-            return A * math.exp(-h_metres / 60.0)
-        if h_km < 1.5:
-            return 0.3 * A * math.exp(-h_metres / 120.0) * shear_factor
-        if h_km < 5.0:
-            return 0.08 * A * math.exp(-h_metres / 600.0) * lapse_correction
-        return 0.02 * A * math.exp(-(h_metres - 5000.0) / 1500.0)
-
-    def wind_profile(alt_km: float) -> float:
-        if alt_km < 0.5:
-            return float(max(2.0, wind_850 * 0.6))
-        if alt_km < 1.5:
-            return float((wind_850 + wind_500) / 2.0)
-        if alt_km < 6.0:
-            return float(wind_500)
-        return float(wind_300)
-
-    def temperature_profile(alt_km: float) -> Optional[float]:
-        if temp_850 is None:
-            return None
+    cn2 = (
+        np.array((A, 0.3 * A * shear_factor, 0.08 * A * lapse_correction, 0.02 * A))[_BUFTON_CN2_BRANCH]
+        * _BUFTON_CN2_SHAPE
+    )
+    winds = np.array(
+        (max(2.0, wind_850 * 0.6), (wind_850 + wind_500) / 2.0, wind_500, wind_300)
+    )[_BUFTON_WIND_BRANCH]
+    temperatures = None
+    if temp_850 is not None:
         lapse_rate = -6.5
-        delta = alt_km - 1.5
-        return float((temp_850 + 273.15) + lapse_rate * delta)
-
-    altitudes = (0.0, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 12.0)
-    layers = _create_layers_from_samples(altitudes, cn2_bufton, wind_profile, temperature_profile)
-    summary = _calculate_summary_from_layers(
-        layers,
+        temperatures = (temp_850 + 273.15) + lapse_rate * (_BUFTON_ALT_KM - 1.5)
+    summary = _summary_from_arrays(
+        _BUFTON_ALT_M,
+        cn2,
+        winds,
         query.wavelength_nm,
-        fallback_wind=float(np.sqrt((wind_300 ** 2 + wind_500 ** 2 + wind_850 ** 2) / 3.0)),
+        fallback_wind=math.sqrt((wind_300 * wind_300 + wind_500 * wind_500 + wind_850 * wind_850) / 3.0),
         base_loss_aod=0.25,
         base_loss_abs=0.12,
+        h53=_BUFTON_H53,
     )
     summary.scintillation_index = float(min(1.5, 0.3 + shear_factor * 0.2))
+    layers = LayerArrays(_BUFTON_ALT_KM, cn2, winds, temperature_k=temperatures)
 
     return AtmosphericProfile(
         model="bufton",
@@ -609,25 +1662,40 @@ def _bufton_provider(query: AtmosphereQuery, client: OpenMeteoClient) -> Atmosph
     )
 
 
+_GREENWOOD_VARIABLES = (
+    "wind_u_component_300hPa",
+    "wind_v_component_300hPa",
+    "wind_u_component_500hPa",
+    "wind_v_component_500hPa",
+    "wind_u_component_700hPa",
+    "wind_v_component_700hPa",
+)
+
+
+_GREENWOOD_ALT_KM = np.array((0.0, 0.2, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0))
+_GREENWOOD_ALT_M = _GREENWOOD_ALT_KM * 1000.0
+_GREENWOOD_H53 = _GREENWOOD_ALT_M ** (5.0 / 3.0)
+_GREENWOOD_CN2_BRANCH, _GREENWOOD_CN2_SHAPE = _piecewise_exp_shape(
+    _GREENWOOD_ALT_KM,
+    np.array((0.5, 2.0, 8.0)),
+    1.0 / np.array((50.0, 200.0, 900.0, 1500.0)),
+    np.array((0.0, 0.0, 0.0, 8000.0)),
+)
+_GREENWOOD_WIND_BRANCH = np.searchsorted(np.array((1.5, 5.0)), _GREENWOOD_ALT_KM, side="right")
+
+
 def _greenwood_provider(query: AtmosphereQuery, client: OpenMeteoClient) -> AtmosphericProfile:
-    variables = [
-        "wind_u_component_300hPa",
-        "wind_v_component_300hPa",
-        "wind_u_component_500hPa",
-        "wind_v_component_500hPa",
-        "wind_u_component_700hPa",
-        "wind_v_component_700hPa",
-    ]
+    variables = list(_GREENWOOD_VARIABLES)
     dataset = client.fetch_hourly(query, variables)
     hourly = dataset["hourly"]
-    idx = _resolve_hour_index(hourly, query.hour_key)
+    idx = _resolve_hour_index(hourly, query.timestamp)
 
     def _wind_speed(key: str) -> float:
-        u = hourly.get(f"wind_u_component_{key}", [None])[idx]
-        v = hourly.get(f"wind_v_component_{key}", [None])[idx]
+        u = _hourly_value(hourly, f"wind_u_component_{key}", idx)
+        v = _hourly_value(hourly, f"wind_v_component_{key}", idx)
         if u is None or v is None:
             raise AtmosphereProviderError(f"Missing wind component for {key}")
-        return float(math.sqrt(u ** 2 + v ** 2))
+        return math.hypot(u, v)
 
     wind_300 = _wind_speed("300hPa")
     wind_500 = _wind_speed("500hPa")
@@ -635,32 +1703,21 @@ def _greenwood_provider(query: AtmosphereQuery, client: OpenMeteoClient) -> Atmo
 
     A = max(query.ground_cn2, 1e-17)
 
-    def cn2_greenwood(h_metres: float) -> float:
-        h_km = h_metres / 1000.0
-        if h_km < 0.5:
-            return A * math.exp(-h_metres / 50.0)
-        if h_km < 2.0:
-            return 0.2 * A * math.exp(-h_metres / 200.0)
-        if h_km < 8.0:
-            return 0.05 * A * math.exp(-h_metres / 900.0)
-        return 0.02 * A * math.exp(-(h_metres - 8000.0) / 1500.0)
-
-    def wind_profile(alt_km: float) -> float:
-        if alt_km < 1.5:
-            return float((wind_700 + wind_500) / 2.0)
-        if alt_km < 5.0:
-            return float((wind_500 + wind_300) / 2.0)
-        return float(wind_300)
-
-    altitudes = (0.0, 0.2, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0)
-    layers = _create_layers_from_samples(altitudes, cn2_greenwood, wind_profile)
-    summary = _calculate_summary_from_layers(
-        layers,
+    cn2 = np.array((A, 0.2 * A, 0.05 * A, 0.02 * A))[_GREENWOOD_CN2_BRANCH] * _GREENWOOD_CN2_SHAPE
+    winds = np.array(
+        ((wind_700 + wind_500) / 2.0, (wind_500 + wind_300) / 2.0, wind_300)
+    )[_GREENWOOD_WIND_BRANCH]
+    summary = _summary_from_arrays(
+        _GREENWOOD_ALT_M,
+        cn2,
+        winds,
         query.wavelength_nm,
         fallback_wind=float((wind_300 + wind_500 + wind_700) / 3.0),
         base_loss_aod=0.22,
         base_loss_abs=0.11,
+        h53=_GREENWOOD_H53,
     )
+    layers = LayerArrays(_GREENWOOD_ALT_KM, cn2, winds)
 
     return AtmosphericProfile(
         model="greenwood",
@@ -687,7 +1744,18 @@ PROVIDERS = {
     "greenwood": _greenwood_provider,
 }
 
+# Open-Meteo variables fetched by each provider, used to coalesce batched fetches.
+_PROVIDER_VARIABLES = {
+    _hv57_provider: _HV57_VARIABLES,
+    _bufton_provider: _BUFTON_VARIABLES,
+    _greenwood_provider: _GREENWOOD_VARIABLES,
+}
+
+# Shared by batched profile prefetches and the weather-field fan-out.
+_FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="open-meteo")
+
 
+@lru_cache(maxsize=32)
 def resolve_model_name(model: str) -> str:
     normalized = (model or "").strip().lower()
     if not normalized or normalized == "auto":
@@ -697,23 +1765,90 @@ def resolve_model_name(model: str) -> str:
     return normalized
 
 
+@lru_cache(maxsize=32)
+def _resolve_provider(model: str) -> Tuple[str, Callable[[AtmosphereQuery, OpenMeteoClient], AtmosphericProfile]]:
+    """Resolve a raw model string to its canonical name and provider callable."""
+    provider_name = resolve_model_name(model)
+    return provider_name, PROVIDERS[provider_name]
+
+
 def build_profile(query: AtmosphereQuery, client: Optional[OpenMeteoClient] = None) -> Dict[str, Any]:
-    provider_name = resolve_model_name(query.model)
-    provider = PROVIDERS[provider_name]
-    client = client or OpenMeteoClient()
-    profile = provider(query, client)
-    return profile.to_dict()
+    """Return the serialised profile for ``query``.
+
+    Profiles built with the shared client are memoised, so the returned dict
+    must be treated as read-only by callers.
+    """
+    provider_name, provider = _resolve_provider(query.model)
+    if client is not None and client is not _CLIENT:
+        return provider(query, client).to_dict()
+    return _build_profile_cached(
+        round(query.lat, 3),
+        round(query.lon, 3),
+        query.timestamp.replace(microsecond=0),
+        provider_name,
+        query.wavelength_nm,
+        query.ground_cn2_day,
+        query.ground_cn2_night,
+        # Roll memoised profiles over with the Open-Meteo data they were built from.
+        int(time.time() // _OPEN_METEO_CACHE.ttl_seconds),
+    )
+
+
+@lru_cache(maxsize=512)
+def _build_profile_cached(
+    lat_key: float,
+    lon_key: float,
+    timestamp: datetime,
+    provider_name: str,
+    wavelength_nm: float,
+    ground_cn2_day: float,
+    ground_cn2_night: float,
+    cache_window: int,
+) -> Dict[str, Any]:
+    query = AtmosphereQuery(
+        lat=lat_key,
+        lon=lon_key,
+        timestamp=timestamp,
+        model=provider_name,
+        ground_cn2_day=ground_cn2_day,
+        ground_cn2_night=ground_cn2_night,
+        wavelength_nm=wavelength_nm,
+    )
+    return PROVIDERS[provider_name](query, _CLIENT).to_dict()
+
+
+def build_profiles(queries: Sequence[AtmosphereQuery]) -> List[Dict[str, Any]]:
+    """Build several profiles, fetching each distinct Open-Meteo dataset once.
+
+    Unique ``(location, date, variables)`` fetches run concurrently and warm the
+    shared cache; the providers then run sequentially against cached data.
+    """
+    fetches: Dict[Tuple[Any, ...], Tuple[AtmosphereQuery, Tuple[str, ...]]] = {}
+    for query in queries:
+        variables = _PROVIDER_VARIABLES[_resolve_provider(query.model)[1]]
+        key = (round(query.lat, 3), round(query.lon, 3), query.date_key, tuple(sorted(variables)))
+        fetches.setdefault(key, (query, variables))
+    futures = [
+        _FETCH_EXECUTOR.submit(_CLIENT.fetch_hourly, query, variables)
+        for query, variables in fetches.values()
+    ]
+    for future in futures:
+        future.result()
+    return [build_profile(query) for query in queries]
 
 
 class AtmosphereService:
     """Facade around the atmospheric model helpers."""
 
     def __init__(self) -> None:
-        self._client = OpenMeteoClient()
+        self._client = _CLIENT
 
     def build_profile(self, query: AtmosphereQuery) -> Dict[str, Any]:
         return build_profile(query, self._client)
 
+    def build_profiles(self, queries: Sequence[AtmosphereQuery]) -> List[Dict[str, Any]]:
+        return build_profiles(queries)
+
 
 # ---------------------------------------------------------------------------
 # Weather field sampling (adapted from meteo_field.py)
@@ -736,19 +1871,20 @@ class WeatherFieldQuery:
     samples: int
 
 
-@dataclass(frozen=True)
-class _HourlyPointQuery:
+class _HourlyPointQuery(NamedTuple):
+    """One weather-field cell; built once per grid cell, hence a tuple rather than a dataclass."""
+
     lat: float
     lon: float
     timestamp: datetime
 
     @property
     def date_key(self) -> str:
-        return self.timestamp.strftime("%Y-%m-%d")
+        return _format_date_key(self.timestamp)
 
     @property
     def hour_key(self) -> str:
-        return self.timestamp.strftime("%Y-%m-%dT%H:00")
+        return _format_hour_key(self.timestamp)
 
 
 VARIABLE_DEFINITIONS: Dict[str, Dict[str, Any]] = {
@@ -808,85 +1944,80 @@ def _resolve_variable(variable: str, level_hpa: int) -> Dict[str, Any]:
     return definition
 
 
-@dataclass
+@dataclass(frozen=True)
 class _GridDefinition:
     rows: int
     cols: int
-    latitudes: List[float]
-    longitudes: List[float]
-
-
-def _lerp(start: float, end: float, fraction: float) -> float:
-    return start + (end - start) * fraction
+    latitudes: np.ndarray
+    longitudes: np.ndarray
 
 
+@lru_cache(maxsize=64)
 def _generate_grid(sample_hint: int) -> _GridDefinition:
+    """Return the (memoised, read-only) sampling grid for ``sample_hint`` points."""
     clamped_samples = max(16, min(900, int(sample_hint)))
     cols = max(12, int(round(sqrt(clamped_samples * 2))))
     rows = max(6, int(ceil(clamped_samples / cols)))
 
-    latitudes = [
-        _lerp(-80.0, 80.0, idx / (rows - 1)) if rows > 1 else 0.0
-        for idx in range(rows)
-    ]
-    longitudes = [
-        _lerp(-180.0, 180.0, idx / (cols - 1)) if cols > 1 else 0.0
-        for idx in range(cols)
-    ]
-
+    latitudes = np.linspace(-80.0, 80.0, rows)
+    longitudes = np.linspace(-180.0, 180.0, cols)
+    latitudes.flags.writeable = False
+    longitudes.flags.writeable = False
     return _GridDefinition(rows=rows, cols=cols, latitudes=latitudes, longitudes=longitudes)
 
 
-def _resolve_hour_index(hourly_block: Dict[str, Any], hour_key: str) -> int:
-    timeline = hourly_block.get("time")
-    if not isinstance(timeline, list):
-        raise AtmosphereProviderError("Open-Meteo hourly timeline unavailable")
-    try:
-        return timeline.index(hour_key)
-    except ValueError as exc:
-        raise AtmosphereProviderError(f"No Open-Meteo sample available for {hour_key}") from exc
+def _weather_field_points(query: WeatherFieldQuery) -> List[_HourlyPointQuery]:
+    grid = _generate_grid(query.samples)
+    return [
+        _HourlyPointQuery(lat=lat, lon=lon, timestamp=query.timestamp)
+        for lat in grid.latitudes.tolist()
+        for lon in grid.longitudes.tolist()
+    ]
+
+
+async def prefetch_weather_field(query: WeatherFieldQuery, client: Optional[OpenMeteoClient] = None) -> None:
+    """Download the datasets behind ``query`` on the event loop so the build only hits the cache."""
+    definition = _resolve_variable(query.variable, query.level_hpa)
+    client = client or _CLIENT
+    await client.fetch_hourly_many_async(_weather_field_points(query), (definition["levels"][query.level_hpa],))
 
 
 def build_weather_field(query: WeatherFieldQuery, client: Optional[OpenMeteoClient] = None) -> Dict[str, Any]:
+    """Sample ``query`` over the grid; ``grid.values`` is a float32 ndarray with NaN for missing cells."""
     definition = _resolve_variable(query.variable, query.level_hpa)
     variable_key = definition["levels"][query.level_hpa]
     grid = _generate_grid(query.samples)
 
-    client = client or OpenMeteoClient()
-    rows: List[List[Any]] = []
-    current_min = inf
-    current_max = -inf
-    accumulator = 0.0
-    valid_count = 0
-
-    for lat in grid.latitudes:
-        row_values: List[Any] = []
-        for lon in grid.longitudes:
-            point_query = _HourlyPointQuery(lat=lat, lon=lon, timestamp=query.timestamp)
-            dataset = client.fetch_hourly(point_query, (variable_key,))
-            hourly = dataset.get("hourly", {})
-            idx = _resolve_hour_index(hourly, point_query.hour_key)
-            series: Sequence[Any] = hourly.get(variable_key, [])
-            value = None
-            if idx < len(series):
-                value = series[idx]
-            if value is None:
-                row_values.append(None)
-                continue
-            numeric = float(value)
-            row_values.append(numeric)
-            if numeric < current_min:
-                current_min = numeric
-            if numeric > current_max:
-                current_max = numeric
-            accumulator += numeric
-            valid_count += 1
-        rows.append(row_values)
-
-    if valid_count == 0 or not isfinite(current_min) or not isfinite(current_max):
+    client = client or _CLIENT
+
+    # All cells share one date and variable, so misses are fetched in bulk requests.
+    point_queries = _weather_field_points(query)
+    datasets = client.fetch_hourly_many(point_queries, (variable_key,))
+
+    # Missing samples stay NaN until the statistics below.
+    values = np.full(grid.rows * grid.cols, np.nan)
+    for cell, (point_query, dataset) in enumerate(zip(point_queries, datasets)):
+        hourly = dataset.get("hourly", {})
+        idx = _resolve_hour_index(hourly, point_query.timestamp)
+        numeric = _hourly_value(hourly, variable_key, idx)
+        if numeric is not None:
+            values[cell] = numeric
+    values = values.reshape(grid.rows, grid.cols)
+
+    # One finiteness pass, then plain reductions over the compacted samples; the
+    # nan* variants would each re-scan and copy the whole grid.
+    finite = values[np.isfinite(values)]
+    valid_count = int(finite.size)
+    if valid_count == 0:
         raise AtmosphereProviderError("No valid samples returned by Open-Meteo")
 
-    mean_value = accumulator / valid_count if valid_count else None
+    current_min = float(finite.min())
+    current_max = float(finite.max())
+    mean_value = float(finite.mean())
+    # Kept as an array: orjson (OPT_SERIALIZE_NUMPY) writes it straight from the
+    # buffer, with missing samples as null.  float32 still round-trips the API's
+    # few-decimal values.
+    rows = values.astype(np.float32)
 
     return {
         "status": "ok",
@@ -918,11 +2049,14 @@ def build_weather_field(query: WeatherFieldQuery, client: Optional[OpenMeteoClie
 
 class WeatherFieldService:
     def __init__(self) -> None:
-        self._client = OpenMeteoClient()
+        self._client = _CLIENT
 
     def build_field(self, query: WeatherFieldQuery) -> Dict[str, Any]:
         return build_weather_field(query, self._client)
 
+    async def prefetch_field(self, query: WeatherFieldQuery) -> None:
+        await prefetch_weather_field(query, self._client)
+
 
 @dataclass
 class TleCacheEntry:
@@ -1040,6 +2174,8 @@ FAVICON_PATH = STATIC_DIR / "favicon.ico"
 
 
 class OGSLocation(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: Optional[str] = None
     name: str = Field(min_length=1)
     lat: float
@@ -1054,6 +2190,8 @@ class UserCreate(BaseModel):
 
 
 class UserRead(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     username: str
     created_at: str
@@ -1069,6 +2207,8 @@ class ChatCreate(BaseModel):
 
 
 class ChatRead(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     user_id: int
     username: str
@@ -1107,6 +2247,74 @@ def _normalize_username(value: str) -> str:
     return value.strip().lower()
 
 
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+_EMPTY_OGS = orjson.dumps([])
+# Built once: validates stored stations and serialises them in pydantic-core.
+_OGS_LIST_ADAPTER = TypeAdapter(List[OGSLocation])
+
+
+def _orjson_default(obj: Any) -> Any:
+    # OPT_SERIALIZE_NUMPY covers contiguous native-endian arrays of the common
+    # dtypes; anything else (views, float16, read-only mappings) lands here.
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Cannot encode {type(obj).__name__} as JSON")
+
+
+def _build_json(builder: Callable[..., Any], *args: Any) -> bytes:
+    """Run ``builder`` and encode its result, so both happen in the worker thread."""
+    return orjson.dumps(builder(*args), default=_orjson_default, option=_ORJSON_OPTIONS)
+
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        # Raw little-endian buffer plus the metadata needed to rebuild the array.
+        array = np.ascontiguousarray(obj, dtype=obj.dtype.newbyteorder("<"))
+        return {"dtype": array.dtype.str, "shape": list(array.shape), "data": array.tobytes()}
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Cannot encode {type(obj).__name__} as msgpack")
+
+
+def _build_msgpack(builder: Callable[..., Any], *args: Any) -> bytes:
+    """Like ``_build_json`` but msgpack-encoded; ndarrays become ``{dtype, shape, data}`` maps."""
+    return msgpack.packb(builder(*args), use_bin_type=True, default=_msgpack_default)
+
+
+def _wants_msgpack(request: Request) -> bool:
+    return msgpack is not None and MSGPACK_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def _parse_request_time(value: str) -> datetime:
+    """Parse a request's ISO-8601 ``time`` as a naive UTC datetime, or raise a 400."""
+    # The C-level fromisoformat beats hand-slicing the fixed ``...Z`` shape in Python.
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Timestamp ISO inválido") from exc
+    # Open-Meteo is queried in UTC: the date window, cache keys and hour index are
+    # all derived from this value, so an offset must be applied here, once.
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _model_response(model: Type[BaseModel], status_code: int = 200, **values: Any) -> ORJSONResponse:
+    """Encode ``values`` through ``model`` without re-validating data that came from the database."""
+    return ORJSONResponse(model.model_construct(**values).model_dump(), status_code=status_code)
+
+
 VARIANT_PAGES: Dict[str, str] = {
         "dashboard": dedent(
                 """\
@@ -1456,9 +2664,87 @@ VARIANT_PAGES: Dict[str, str] = {
 }
 
 
+@dataclass(frozen=True)
+class StaticAsset:
+    """A page or file held in memory and served with a strong ETag."""
+
+    body: bytes
+    media_type: str
+    etag: str
+    cache_control: str = "public, max-age=300"
+    last_modified: Optional[str] = None
+
+    @classmethod
+    def load(cls, path: Path, media_type: str) -> Optional["StaticAsset"]:
+        try:
+            body = path.read_bytes()
+            modified = path.stat().st_mtime
+        except OSError:
+            return None
+        return cls.from_body(body, media_type, last_modified=formatdate(modified, usegmt=True))
+
+    @classmethod
+    def from_body(cls, body: bytes, media_type: str, **options: Any) -> "StaticAsset":
+        etag = f'"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+        return cls(body=body, media_type=media_type, etag=etag, **options)
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison, as RFC 9110 requires for If-None-Match.
+        return any(tag.strip().removeprefix("W/") == self.etag for tag in if_none_match.split(","))
+
+    def not_modified(self, request: Request) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            # When both are sent, If-None-Match wins (RFC 9110 section 13.2.2).
+            return self.matches(if_none_match)
+        if_modified_since = request.headers.get("if-modified-since")
+        if not if_modified_since or self.last_modified is None:
+            return False
+        try:
+            return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(self.last_modified)
+        except (TypeError, ValueError):
+            return False
+
+    @classmethod
+    def scan(cls, directory: Path, exclude: Sequence[Path] = ()) -> Dict[str, "StaticAsset"]:
+        """Load every file below ``directory``, keyed by its URL path relative to it."""
+        skipped = {path.resolve() for path in exclude}
+        assets: Dict[str, StaticAsset] = {}
+        for path in sorted(directory.rglob("*")):
+            if not path.is_file() or path.name.startswith(".") or path.resolve() in skipped:
+                continue
+            media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            asset = cls.load(path, media_type)
+            if asset is not None:
+                assets[path.relative_to(directory).as_posix()] = asset
+        return assets
+
+    def response(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = self.last_modified
+        if self.not_modified(request):
+            return Response(status_code=304, headers=headers)
+        if request.method == "HEAD":
+            headers["Content-Length"] = str(len(self.body))
+            return Response(media_type=self.media_type, headers=headers)
+        return Response(content=self.body, media_type=self.media_type, headers=headers)
+
+
 class QKDApplication:
     """Composes the FastAPI app and exposes the service facade."""
 
+    # Worker processes for the atmosphere/weather builders; 0 keeps them on the
+    # threadpool, which shares one in-process Open-Meteo and profile cache.
+    COMPUTE_PROCESSES = int(os.environ.get("QKD_COMPUTE_PROCESSES", "0"))
+    # Threads available to run_in_threadpool in each server worker; anyio's default
+    # of 40 is quickly exhausted by concurrent Open-Meteo-bound builds.
+    THREADPOOL_SIZE = int(os.environ.get("QKD_THREADPOOL_SIZE", "128"))
+
     def __init__(self) -> None:
         self.database = DatabaseGateway(BASE_DIR)
         self.ogs_store = OGSStore(DATA_PATH)
@@ -1466,27 +2752,79 @@ class QKDApplication:
         self.weather = WeatherFieldService()
         self.tles = TleService()
         self.variant_pages = VARIANT_PAGES
+        self.layout_pages = {
+            name: StaticAsset.from_body(template.encode("utf-8"), "text/html") for name, template in VARIANT_PAGES.items()
+        }
+        # Pages are read once; restart the server to pick up edits to these files.
+        self.index_page = StaticAsset.load(INDEX_HTML, "text/html")
+        self.orbit3d_page = StaticAsset.load(ORBIT3D_HTML, "text/html")
+        self.favicon = StaticAsset.load(FAVICON_PATH, "image/x-icon")
+        # The rest of /static is prewarmed the same way; the OGS store rewrites its
+        # files at runtime, so those (and anything added later) are read from disk.
+        self.static_assets = StaticAsset.scan(STATIC_DIR, exclude=(DATA_PATH, self.ogs_store.journal_path))
+        self.static_files = StaticFiles(directory=str(STATIC_DIR))
+        # (store snapshot, encoded listing): the store hands out the same tuple until it
+        # changes, so identity tells whether the cached GET /api/ogs body is current.
+        self._ogs_listing: Optional[Tuple[Sequence[Dict[str, Any]], StaticAsset]] = None
+        self.compute_pool: Optional[ProcessPoolExecutor] = None
+        # Spawned workers inherit QKD_COMPUTE_PROCESSES; they must not start pools of their own.
+        if self.COMPUTE_PROCESSES > 0 and multiprocessing.parent_process() is None:
+            # Spawned rather than forked: the parent already runs writer and cache threads.
+            self.compute_pool = ProcessPoolExecutor(
+                max_workers=self.COMPUTE_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+            )
 
-        self.app = FastAPI(title="QKD Europe Planner", version="0.2.0")
-        self.app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+        self.app = FastAPI(title="QKD Europe Planner", version="0.2.0", default_response_class=ORJSONResponse)
         self._configure_routes()
 
+    def _ogs_listing_asset(self) -> StaticAsset:
+        stations = self.ogs_store.list()
+        cached = self._ogs_listing
+        if cached is None or cached[0] is not stations:
+            if stations:
+                body = _OGS_LIST_ADAPTER.dump_json(_OGS_LIST_ADAPTER.validate_python(stations))
+            else:
+                body = _EMPTY_OGS
+            # The list changes under the client, so it must revalidate on every poll.
+            asset = StaticAsset.from_body(body, "application/json", cache_control="no-cache")
+            self._ogs_listing = cached = (stations, asset)
+        return cached[1]
+
+    async def _run_builder(
+        self, builder: Callable[..., Any], *args: Any, encoder: Callable[..., bytes] = _build_json
+    ) -> bytes:
+        """Build and encode a response body off the event loop."""
+        if self.compute_pool is None:
+            return await run_in_threadpool(encoder, builder, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.compute_pool, encoder, builder, *args)
+
     # ------------------------------------------------------------------
     # Route wiring
     # ------------------------------------------------------------------
 
     def _configure_routes(self) -> None:
         app = self.app
-        variant_pages = self.variant_pages
+        layout_pages = self.layout_pages
 
         @app.on_event("startup")
         async def _startup() -> None:
+            anyio.to_thread.current_default_thread_limiter().total_tokens = self.THREADPOOL_SIZE
             await run_in_threadpool(self.database.initialise)
+            await run_in_threadpool(self.ogs_store.migrate)
+
+        @app.on_event("shutdown")
+        async def _shutdown() -> None:
+            await self.database.aclose()
+            await close_async_session()
+            await run_in_threadpool(self.ogs_store.compact)
+            if self.compute_pool is not None:
+                self.compute_pool.shutdown(wait=False, cancel_futures=True)
 
         @app.get("/favicon.ico", include_in_schema=False)
-        async def favicon():
-            if FAVICON_PATH.exists():
-                return FileResponse(str(FAVICON_PATH))
+        async def favicon(request: Request):
+            if self.favicon is not None:
+                return self.favicon.response(request)
             return Response(status_code=204)
 
         @app.get("/health")
@@ -1494,30 +2832,37 @@ class QKDApplication:
             return {"status": "ok"}
 
         @app.get("/", response_class=HTMLResponse)
-        async def root():
-            if not INDEX_HTML.exists():
+        async def root(request: Request):
+            if self.index_page is None:
                 return HTMLResponse("index.html not found", status_code=404)
-            return FileResponse(str(INDEX_HTML))
+            return self.index_page.response(request)
 
         @app.get("/layouts/{variant}", response_class=HTMLResponse)
-        async def layout_page(variant: str):
-            template = variant_pages.get(variant.lower())
-            if template is None:
+        async def layout_page(variant: str, request: Request):
+            page = layout_pages.get(variant.lower())
+            if page is None:
                 raise HTTPException(status_code=404, detail="Layout no disponible.")
-            return HTMLResponse(template)
+            return page.response(request)
 
         @app.get("/static/version-{variant}.html", include_in_schema=False)
-        async def legacy_layout(variant: str):
-            template = variant_pages.get(variant.lower())
-            if template is None:
+        async def legacy_layout(variant: str, request: Request):
+            page = layout_pages.get(variant.lower())
+            if page is None:
                 raise HTTPException(status_code=404, detail="Layout no disponible.")
-            return HTMLResponse(template)
+            return page.response(request)
+
+        @app.api_route("/static/{path:path}", methods=["GET", "HEAD"], include_in_schema=False, name="static")
+        async def static_file(path: str, request: Request):
+            asset = self.static_assets.get(path)
+            if asset is None:
+                return await self.static_files.get_response(path, request.scope)
+            return asset.response(request)
 
         @app.get("/orbit3d", response_class=HTMLResponse)
-        async def orbit3d():
-            if not ORBIT3D_HTML.exists():
+        async def orbit3d(request: Request):
+            if self.orbit3d_page is None:
                 return HTMLResponse("orbit3d.html not found", status_code=404)
-            return FileResponse(str(ORBIT3D_HTML))
+            return self.orbit3d_page.response(request)
 
         # ------------------- Constellation TLE access ----------------
 
@@ -1540,50 +2885,36 @@ class QKDApplication:
         # ------------------------- OGS management ----------------------
 
         @app.get("/api/ogs", response_model=List[OGSLocation])
-        async def list_ogs():
-            raw = await run_in_threadpool(self.ogs_store.list)
-            needs_write = False
-            processed: List[Dict[str, Any]] = []
-            for idx, item in enumerate(raw):
-                record = dict(item)
-                if "aperture_m" not in record or not isinstance(record["aperture_m"], (int, float)):
-                    record["aperture_m"] = 1.0
-                    needs_write = True
-                if not record.get("id"):
-                    record["id"] = f"station-{uuid4().hex[:8]}-{idx}"
-                    needs_write = True
-                processed.append(record)
-            if needs_write:
-                await run_in_threadpool(self.ogs_store.overwrite, processed)
-            return processed
+        async def list_ogs(request: Request):
+            # The store normalises records when it (re)loads the file, and the encoded
+            # listing and its ETag are reused until the store's snapshot changes.
+            listing = await run_in_threadpool(self._ogs_listing_asset)
+            return listing.response(request)
 
         @app.post("/api/ogs", response_model=OGSLocation)
         async def add_ogs(loc: OGSLocation):
             if not is_in_europe_bbox(loc.lat, loc.lon):
                 raise HTTPException(status_code=400, detail="La ubicacion esta fuera del area de Europa definida.")
-            record = await run_in_threadpool(self.ogs_store.upsert, loc.dict())
-            return OGSLocation(**record)
+            record = await run_in_threadpool(self.ogs_store.upsert, loc.model_dump())
+            return _model_response(OGSLocation, **record)
 
         @app.delete("/api/ogs")
         async def clear_ogs():
             await run_in_threadpool(self.ogs_store.delete_all)
-            return JSONResponse({"status": "ok", "message": "Todas las OGS han sido eliminadas."})
+            return ORJSONResponse({"status": "ok", "message": "Todas las OGS han sido eliminadas."})
 
         @app.delete("/api/ogs/{station_id}")
         async def delete_ogs(station_id: str):
             removed = await run_in_threadpool(self.ogs_store.delete, station_id)
             if not removed:
                 raise HTTPException(status_code=404, detail="Estación no encontrada.")
-            return JSONResponse({"status": "ok", "deleted": station_id})
+            return ORJSONResponse({"status": "ok", "deleted": station_id})
 
         # ---------------------- Atmospheric queries -------------------
 
         @app.post("/api/get_atmosphere_profile")
         async def get_atmosphere_profile(req: AtmosRequest):
-            try:
-                target_dt = datetime.fromisoformat(req.time.rstrip('Z'))
-            except ValueError as exc:
-                raise HTTPException(status_code=400, detail="Timestamp ISO inválido") from exc
+            target_dt = _parse_request_time(req.time)
             wavelength = req.wavelength_nm or 810.0
             query = AtmosphereQuery(
                 lat=req.lat,
@@ -1595,8 +2926,8 @@ class QKDApplication:
                 wavelength_nm=wavelength,
             )
             try:
-                profile = await run_in_threadpool(self.atmosphere.build_profile, query)
-                return profile
+                body = await self._run_builder(self.atmosphere.build_profile, query)
+                return Response(content=body, media_type="application/json")
             except AtmosphereModelNotFoundError as exc:
                 raise HTTPException(status_code=404, detail=str(exc)) from exc
             except AtmosphereProviderError as exc:
@@ -1605,11 +2936,8 @@ class QKDApplication:
                 raise HTTPException(status_code=500, detail=f"Error al procesar atmósfera: {exc}") from exc
 
         @app.post("/api/get_weather_field")
-        async def get_weather_field(req: WeatherFieldRequest):
-            try:
-                target_dt = datetime.fromisoformat(req.time.rstrip('Z'))
-            except ValueError as exc:
-                raise HTTPException(status_code=400, detail="Timestamp ISO inválido") from exc
+        async def get_weather_field(req: WeatherFieldRequest, request: Request):
+            target_dt = _parse_request_time(req.time)
             query = WeatherFieldQuery(
                 timestamp=target_dt,
                 variable=req.variable,
@@ -1617,7 +2945,14 @@ class QKDApplication:
                 samples=req.samples,
             )
             try:
-                return await run_in_threadpool(self.weather.build_field, query)
+                if httpx is not None:
+                    # The downloads run on the event loop; the build then reads the cache.
+                    await self.weather.prefetch_field(query)
+                if _wants_msgpack(request):
+                    body = await self._run_builder(self.weather.build_field, query, encoder=_build_msgpack)
+                    return Response(content=body, media_type=MSGPACK_MEDIA_TYPE, headers={"Vary": "Accept"})
+                body = await self._run_builder(self.weather.build_field, query)
+                return Response(content=body, media_type="application/json", headers={"Vary": "Accept"})
             except WeatherFieldParameterError as exc:
                 raise HTTPException(status_code=400, detail=str(exc)) from exc
             except AtmosphereProviderError as exc:
@@ -1632,7 +2967,7 @@ class QKDApplication:
             record = await run_in_threadpool(self.database.get_user_by_id, user_id)
             if record is None:
                 raise HTTPException(status_code=404, detail="Usuario no encontrado.")
-            return UserRead(**record.__dict__)
+            return _model_response(UserRead, **record.__dict__)
 
         @app.post("/api/login", response_model=AuthResponse)
         async def login_user(payload: UserCreate):
@@ -1643,7 +2978,7 @@ class QKDApplication:
             record = await run_in_threadpool(self.database.verify_credentials, username, payload.password)
             if record is None:
                 raise HTTPException(status_code=401, detail="Credenciales incorrectas.")
-            return AuthResponse(**record.__dict__, message="Inicio de sesión correcto.")
+            return _model_response(AuthResponse, **record.__dict__, message="Inicio de sesión correcto.")
 
         @app.post("/api/logout")
         async def logout_user():
@@ -1652,12 +2987,13 @@ class QKDApplication:
         @app.get("/api/users/count", response_model=UserCount)
         async def user_count():
             count = await run_in_threadpool(self.database.count_users)
-            return UserCount(count=count)
+            return _model_response(UserCount, count=count)
 
         @app.get("/api/chats", response_model=List[ChatRead])
         async def list_chats(limit: int = 50):
-            records = await run_in_threadpool(self.database.list_chat_messages, limit)
-            return [ChatRead(**record.__dict__) for record in records]
+            # SQLite emits the response body directly; no per-row Python objects.
+            body = await run_in_threadpool(self.database.list_chat_messages_json, limit)
+            return Response(content=body, media_type="application/json")
 
         @app.post("/api/chats", response_model=ChatRead, status_code=201)
         async def post_chat_message(payload: ChatCreate):
@@ -1666,8 +3002,10 @@ class QKDApplication:
             user = await run_in_threadpool(self.database.get_user_by_id, payload.user_id)
             if user is None:
                 raise HTTPException(status_code=404, detail="Usuario no encontrado.")
-            record = await run_in_threadpool(self.database.store_chat_message, payload.user_id, payload.message.strip())
-            return ChatRead(**record.__dict__)
+            record = await self.database.store_chat_message_async(
+                user.id, user.username, payload.message.strip()
+            )
+            return _model_response(ChatRead, status_code=201, **record.__dict__)
 
 
 def create_app() -> FastAPI:
@@ -1675,6 +3013,18 @@ def create_app() -> FastAPI:
     return QKDApplication().app
 
 
-# Module level instance for run_app.py compatibility
-application = QKDApplication()
-app = application.app
\ No newline at end of file
+_APPLICATION: Optional[QKDApplication] = None
+
+
+def __getattr__(name: str) -> Any:
+    """Build the module-level ``application``/``app`` (run_app.py's target) on first access.
+
+    Compute workers import this module only to unpickle builders and services, so
+    they never construct the stores, static map and pools they would not use.
+    """
+    global _APPLICATION
+    if name in ("application", "app"):
+        if _APPLICATION is None:
+            _APPLICATION = QKDApplication()
+        return _APPLICATION if name == "application" else _APPLICATION.app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""Batched chat inserts hand every caller the id of its own row."""
+
+import asyncio
+
+import orjson
+
+from app.backend import DatabaseGateway
+
+
+def test_concurrent_posts_get_unique_increasing_ids(tmp_path):
+    database = DatabaseGateway(tmp_path)
+    database.initialise()
+    alice = database.create_user("alice", "secret1")
+    bob = database.create_user("bob", "secret2")
+
+    async def post_all():
+        try:
+            return await asyncio.gather(
+                *(
+                    database.store_chat_message_async(user.id, user.username, f"message {index}")
+                    for index, user in enumerate([alice, bob] * 150)
+                )
+            )
+        finally:
+            await database.aclose()
+
+    records = asyncio.run(post_all())
+
+    ids = [record.id for record in records]
+    assert len(set(ids)) == len(ids) == 300
+    # The queue is drained in submission order, so ids follow it.
+    assert ids == sorted(ids)
+
+    listed = orjson.loads(database.list_chat_messages_json(500))
+    assert [(row["id"], row["user_id"], row["username"], row["message"]) for row in listed] == [
+        (record.id, record.user_id, record.username, record.message) for record in records
+    ]
@@ -0,0 +1,99 @@
+"""OGSStore journal replay, compaction and revalidation."""
+
+import orjson
+import pytest
+
+from app.backend import OGSStore
+
+
+def station(identifier, name=None, **extra):
+    return {"id": identifier, "name": name or identifier, "lat": 40.0, "lon": -3.7, "aperture_m": 1.0, **extra}
+
+
+@pytest.fixture
+def data_path(tmp_path):
+    path = tmp_path / "ogs_locations.json"
+    path.write_bytes(orjson.dumps([station("madrid")]))
+    return path
+
+
+def on_disk(path):
+    return [record["id"] for record in orjson.loads(path.read_bytes())]
+
+
+def test_journal_is_replayed_after_a_crash(data_path):
+    store = OGSStore(data_path)
+    store.upsert(station("lisbon"))
+    store.upsert(station("madrid", name="Madrid II"))
+    store.delete("lisbon")
+    store.upsert(station("paris"))
+    # No compact(): the process "dies" with the changes only in the journal.
+    assert on_disk(data_path) == ["madrid"]
+    assert store.journal_path.exists()
+
+    restarted = OGSStore(data_path)
+    assert [(record["id"], record["name"]) for record in restarted.list()] == [
+        ("madrid", "Madrid II"),
+        ("paris", "paris"),
+    ]
+
+    restarted.compact()
+    assert on_disk(data_path) == ["madrid", "paris"]
+    assert not restarted.journal_path.exists()
+
+
+def test_torn_trailing_journal_line_is_ignored(data_path):
+    OGSStore(data_path).upsert(station("lisbon"))
+    journal_path = data_path.with_suffix(".journal.jsonl")
+    with journal_path.open("ab") as handle:
+        handle.write(orjson.dumps({"op": "upsert", "record": station("paris")})[:25])
+
+    store = OGSStore(data_path)
+    assert [record["id"] for record in store.list()] == ["madrid", "lisbon"]
+    # The torn line is folded away, so the next append starts on a clean line.
+    store.upsert(station("rome"))
+    assert [record["id"] for record in OGSStore(data_path).list()] == ["madrid", "lisbon", "rome"]
+
+
+def test_delete_then_upsert_keeps_the_last_operation(data_path):
+    store = OGSStore(data_path)
+    store.upsert(station("lisbon", name="first"))
+    assert store.delete("lisbon")
+    store.upsert(station("lisbon", name="second"))
+    store.upsert(station("rome"))
+    assert store.delete("rome")
+    assert not store.delete("rome")
+
+    expected = [("madrid", "madrid"), ("lisbon", "second")]
+    assert [(record["id"], record["name"]) for record in store.list()] == expected
+    assert [(record["id"], record["name"]) for record in OGSStore(data_path).list()] == expected
+
+
+def test_external_edit_is_picked_up_after_the_revalidation_window(data_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.backend.time.monotonic", lambda: clock[0])
+    store = OGSStore(data_path)
+    assert [record["id"] for record in store.list()] == ["madrid"]
+
+    data_path.write_bytes(orjson.dumps([station("madrid"), station("berlin")]))
+    # Reads inside the window are served from the snapshot...
+    assert [record["id"] for record in store.list()] == ["madrid"]
+    clock[0] += OGSStore.REVALIDATE_S
+    # ...and see the edit once it has elapsed.
+    assert [record["id"] for record in store.list()] == ["madrid", "berlin"]
+
+
+def test_mutations_revalidate_inside_the_window(data_path):
+    first = OGSStore(data_path)
+    second = OGSStore(data_path)
+    first.list()
+    second.list()
+
+    first.upsert(station("lisbon"))
+    second.upsert(station("paris"))
+    second.compact()
+
+    assert on_disk(data_path) == ["madrid", "lisbon", "paris"]
+    # A later mutation through the first store builds on both stations too.
+    first.upsert(station("rome"))
+    assert [record["id"] for record in OGSStore(data_path).list()] == ["madrid", "lisbon", "paris", "rome"]
@@ -0,0 +1,71 @@
+"""Request timestamps are normalised to UTC before they reach the Open-Meteo lookups."""
+
+import calendar
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from app import backend
+
+
+@pytest.fixture
+def open_meteo(monkeypatch, tmp_path):
+    """Serve every Open-Meteo download from a synthetic day whose value is the UTC hour."""
+    requested_dates = []
+
+    def fake_download(latitude, longitude, date_key, variable_tuple):
+        requested_dates.append(date_key)
+        start = calendar.timegm(datetime.fromisoformat(date_key).timetuple())
+        location = {
+            "hourly": {
+                "time": [start + 3600 * hour for hour in range(24)],
+                **{variable: [float(hour) for hour in range(24)] for variable in variable_tuple},
+            }
+        }
+        count = len(str(latitude).split(","))
+        return orjson.dumps([location] * count if count > 1 else location)
+
+    cache = backend.OpenMeteoCache(tmp_path / "openmeteo.sqlite3", ttl=timedelta(hours=1))
+    monkeypatch.setattr(backend, "_OPEN_METEO_CACHE", cache)
+    monkeypatch.setattr(backend, "_download_open_meteo", fake_download)
+    return requested_dates
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("2024-05-01T12:00:00Z", datetime(2024, 5, 1, 12)),
+        ("2024-05-01T12:00:00.000Z", datetime(2024, 5, 1, 12)),
+        ("2024-05-01T12:00:00", datetime(2024, 5, 1, 12)),
+        ("2024-05-01T01:00:00+02:00", datetime(2024, 4, 30, 23)),
+        ("2024-04-30T22:30:00-03:00", datetime(2024, 5, 1, 1, 30)),
+    ],
+)
+def test_parse_request_time_returns_naive_utc(value, expected):
+    parsed = backend._parse_request_time(value)
+    assert parsed == expected
+    assert parsed.tzinfo is None
+
+
+def test_parse_request_time_rejects_garbage():
+    with pytest.raises(HTTPException) as excinfo:
+        backend._parse_request_time("garbage")
+    assert excinfo.value.status_code == 400
+
+
+def test_offset_time_crossing_midnight_reads_the_utc_day(open_meteo):
+    query = backend.WeatherFieldQuery(
+        timestamp=backend._parse_request_time("2024-05-01T01:00:00+02:00"),
+        variable="wind_speed",
+        level_hpa=200,
+        samples=16,
+    )
+    field = backend.build_weather_field(query)
+
+    assert set(open_meteo) == {"2024-04-30"}
+    assert field["timestamp"] == "2024-04-30T23:00:00Z"
+    grid = field["grid"]
+    assert grid["valid_samples"] == grid["rows"] * grid["cols"]
+    assert grid["min"] == grid["max"] == 23.0